@@ -0,0 +1,104 @@
+"""Bulk product update benchmark.
+
+Seeds products for one seller in an in-memory SQLite database, then
+reprices and restocks all of them twice: once with one
+PUT /api/products/{id} per product and once with PATCH /api/products/bulk.
+Reports the wall time and products per second of each.
+
+    python -m benchmarks.bulk_update --products 2000
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("SECRET", "benchmark-secret")
+
+import httpx
+from sqlalchemy import insert
+from src.main import app
+from src.database.core import SessionLocal, async_engine
+from src.entities.category import Category
+from src.entities.products import Product
+from src.entities.users import User, UserRole
+from src.auth.service import password_hasher
+
+USERNAME = "benchseller"
+PASSWORD = "Bench@12345!"
+
+
+def seed(products: int) -> list:
+    db = SessionLocal()
+    try:
+        seller = User(
+            email="seller@example.com",
+            username=USERNAME,
+            hashed_password=password_hasher.hash_blocking(PASSWORD),
+            role=UserRole.SELLER,
+            is_verified=True
+        )
+        category = Category(name="Bench")
+        db.add_all([seller, category])
+        db.commit()
+
+        rows = db.execute(insert(Product).returning(Product.id), [
+            {"name": f"Bench product {i}", "price": 10.0, "stock": 5, "category_id": category.id, "seller_id": seller.id}
+            for i in range(products)
+        ]).scalars().all()
+        db.commit()
+        return list(rows)
+    finally:
+        db.close()
+
+
+async def run(product_ids: list):
+    rng = random.Random(0)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post("/api/auth/login", data={"username": USERNAME, "password": PASSWORD})
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        started = time.perf_counter()
+        for product_id in product_ids:
+            response = await client.put(
+                f"/api/products/{product_id}",
+                data={"price": round(rng.uniform(1, 500), 2), "stock": rng.randint(0, 100)},
+                headers=headers
+            )
+            response.raise_for_status()
+        individual = time.perf_counter() - started
+
+        patches = [
+            {"id": product_id, "price": round(rng.uniform(1, 500), 2), "stock": rng.randint(0, 100)}
+            for product_id in product_ids
+        ]
+        started = time.perf_counter()
+        response = await client.patch("/api/products/bulk", json=patches, headers=headers)
+        response.raise_for_status()
+        bulk = time.perf_counter() - started
+        assert response.json()["updated"] == len(product_ids), response.json()
+
+    await async_engine.dispose()
+    return individual, bulk
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk product update benchmark")
+    parser.add_argument("--products", type=int, default=2000)
+    args = parser.parse_args()
+
+    product_ids = seed(args.products)
+    individual, bulk = asyncio.run(run(product_ids))
+    password_hasher.shutdown()
+
+    print(f"products:               {args.products}")
+    print(f"individual PUTs:        {individual:.2f}s ({args.products / individual:.0f} products/sec)")
+    print(f"one bulk PATCH:         {bulk:.2f}s ({args.products / bulk:.0f} products/sec)")
+    print(f"speedup:                {individual / bulk:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
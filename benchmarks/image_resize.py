@@ -0,0 +1,112 @@
+"""Resized image cache-hit benchmark.
+
+Stores one photo-sized image in a throwaway SQLite database, warms the
+resize cache, then requests the resized copy from
+GET /api/images/{digest}/resize and the same bytes from the /static mount
+in-process. Reports per-request latency of each, and of a 304 revalidation.
+
+    python -m benchmarks.image_resize --requests 2000 --width 480
+"""
+import argparse
+import asyncio
+import hashlib
+import io
+import os
+import random
+import shutil
+import tempfile
+import time
+
+# Files live under ./static and ./cache, so run in a scratch directory.
+# Image pool workers re-import this module and must not make their own.
+if __name__ == "__main__":
+    WORK_DIR = tempfile.mkdtemp(prefix="image-resize-")
+    os.chdir(WORK_DIR)
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{WORK_DIR}/bench.db")
+    os.environ.setdefault("SECRET", "benchmark-secret")
+
+import httpx
+from PIL import Image as PILImage
+from src.main import app
+from src.database.core import SessionLocal, async_engine
+from src.entities.images import Image, ImageStatus
+from src.image_processing import image_pipeline
+from src.images.cache import resize_cache
+from src.upload_settings import PRODUCT_IMAGES_DIR
+
+
+def store_image() -> str:
+    rng = random.Random(0)
+    buffer = io.BytesIO()
+    PILImage.frombytes("RGB", (2400, 1600), rng.randbytes(2400 * 1600 * 3)).save(buffer, "JPEG", quality=90)
+    data = buffer.getvalue()
+    digest = hashlib.sha256(data).hexdigest()
+    path = PRODUCT_IMAGES_DIR / f"{digest}.jpg"
+    path.write_bytes(data)
+
+    db = SessionLocal()
+    try:
+        db.add(Image(sha256=digest, size=len(data), path=str(path), url=f"/{path.as_posix()}", status=ImageStatus.READY, ref_count=1))
+        db.commit()
+    finally:
+        db.close()
+    return digest
+
+
+async def timed(client: httpx.AsyncClient, url: str, requests: int, headers: dict = None, expect: int = 200) -> list:
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = await client.get(url, headers=headers)
+        latencies.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == expect, response.status_code
+    return sorted(latencies)
+
+
+async def run(digest: str, requests: int, width: int) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        resize_url = f"/api/images/{digest}/resize?width={width}"
+        started = time.perf_counter()
+        response = await client.get(resize_url)
+        response.raise_for_status()
+        first = (time.perf_counter() - started) * 1000
+
+        # The same bytes as a plain static file, for a like-for-like comparison
+        static_path = PRODUCT_IMAGES_DIR / f"{digest}-{width}.webp"
+        static_path.write_bytes(response.content)
+
+        results = {
+            "first request (render)": [first],
+            "resize cache hit": await timed(client, resize_url, requests),
+            "resize 304": await timed(client, resize_url, requests, {"If-None-Match": response.headers["etag"]}, 304),
+            "static mount": await timed(client, f"/{static_path.as_posix()}", requests),
+        }
+
+    await async_engine.dispose()
+    return results, len(response.content)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resized image cache-hit benchmark")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--width", type=int, default=480)
+    args = parser.parse_args()
+
+    digest = store_image()
+    results, size = asyncio.run(run(digest, args.requests, args.width))
+    stats = resize_cache.stats()
+    image_pipeline.shutdown()
+    shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+    print(f"requests per case:      {args.requests}")
+    print(f"resized size:           {size / 1024:.1f}KB ({args.width}px wide WebP)")
+    for name, latencies in results.items():
+        p50 = latencies[len(latencies) // 2]
+        p99 = latencies[max(int(len(latencies) * 0.99) - 1, 0)]
+        print(f"{name + ':':<24}p50 {p50:.2f}ms  p99 {p99:.2f}ms")
+    print(f"cache hits/misses:      {stats['hits']} / {stats['misses']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Image upload queue benchmark.
+
+Posts images to POST /api/products/upload/product-image in-process against
+a throwaway SQLite database. Storage is the local-filesystem backend
+behind an artificial delay that stands in for a remote upload. Reports how
+long the requests took and how long until every image was ready.
+
+    python -m benchmarks.image_uploads --uploads 100 --remote-latency 0.2
+"""
+import argparse
+import asyncio
+import io
+import os
+import random
+import shutil
+import tempfile
+import time
+
+# Uploads are saved under ./static, so run in a scratch directory. SQLite
+# gets a file: the in-memory engine shares one connection between threads.
+WORK_DIR = tempfile.mkdtemp(prefix="image-uploads-")
+os.chdir(WORK_DIR)
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{WORK_DIR}/bench.db")
+os.environ.setdefault("SECRET", "benchmark-secret")
+
+import httpx
+from PIL import Image as PILImage
+from sqlalchemy import func, select
+from src.main import app
+from src.database.core import SessionLocal, async_engine
+from src.entities.images import Image, ImageStatus
+from src.entities.users import User, UserRole
+from src.auth.service import password_hasher
+from src.images.queue import upload_queue
+from src.images.storage import LocalStorage
+
+USERNAME = "benchseller"
+PASSWORD = "Bench@12345!"
+
+
+class DelayedStorage:
+    """Local storage that takes as long as a remote upload would."""
+
+    def __init__(self, storage, delay: float):
+        self.storage = storage
+        self.delay = delay
+
+    def upload(self, path: str, folder: str) -> dict:
+        time.sleep(self.delay)
+        return self.storage.upload(path, folder)
+
+
+def create_user():
+    db = SessionLocal()
+    try:
+        db.add(User(
+            email="seller@example.com",
+            username=USERNAME,
+            hashed_password=password_hasher.hash_blocking(PASSWORD),
+            role=UserRole.SELLER,
+            is_verified=True
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+
+def count_ready() -> int:
+    db = SessionLocal()
+    try:
+        return db.scalar(select(func.count(Image.id)).where(Image.status == ImageStatus.READY))
+    finally:
+        db.close()
+
+
+async def run(uploads: int, concurrency: int) -> tuple:
+    # Distinct images: identical bytes would be stored and uploaded once
+    rng = random.Random(0)
+    payloads = []
+    for _ in range(uploads):
+        image = io.BytesIO()
+        PILImage.frombytes("RGB", (800, 600), rng.randbytes(800 * 600 * 3)).save(image, "JPEG")
+        payloads.append(image.getvalue())
+
+    upload_queue.start()
+    transport = httpx.ASGITransport(app=app)
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post("/api/auth/login", data={"username": USERNAME, "password": PASSWORD})
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        async def upload(payload: bytes):
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.post(
+                    "/api/products/upload/product-image",
+                    files={"file": ("bench.jpg", payload, "image/jpeg")},
+                    headers=headers
+                )
+                response.raise_for_status()
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(upload(payload) for payload in payloads))
+        accepted = time.perf_counter() - started
+
+        while await asyncio.to_thread(count_ready) < uploads:
+            await asyncio.sleep(0.05)
+        ready = time.perf_counter() - started
+
+    await upload_queue.stop()
+    await async_engine.dispose()
+    return accepted, ready, sorted(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Image upload queue benchmark")
+    parser.add_argument("--uploads", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent client requests")
+    parser.add_argument("--remote-latency", type=float, default=0.2, help="seconds per simulated remote upload")
+    args = parser.parse_args()
+
+    create_user()
+    with tempfile.TemporaryDirectory() as storage_dir:
+        upload_queue.storage = DelayedStorage(LocalStorage(storage_dir), args.remote_latency)
+        accepted, ready, latencies = asyncio.run(run(args.uploads, args.concurrency))
+    password_hasher.shutdown()
+    shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+    print(f"uploads:                 {args.uploads}")
+    print(f"queue workers:           {upload_queue.concurrency}")
+    print(f"simulated remote upload: {args.remote_latency * 1000:.0f}ms")
+    print(f"request latency p50/p99: {latencies[len(latencies) // 2]:.1f}ms / {latencies[int(len(latencies) * 0.99) - 1]:.1f}ms")
+    print(f"all accepted after:      {accepted:.2f}s")
+    print(f"all ready after:         {ready:.2f}s")
+    print(f"inline uploads would need at least {args.uploads * args.remote_latency:.1f}s of request time")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Login throughput benchmark.
+
+Drives POST /api/auth/login in-process against an in-memory SQLite
+database and reports logins per second, logins per second per hashing
+worker, and how long a trivial request waits while logins are running
+(a blocked event loop shows up here).
+
+    python -m benchmarks.login_throughput --logins 200 --concurrency 32
+"""
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("SECRET", "benchmark-secret")
+
+import httpx
+from src.main import app
+from src.database.core import SessionLocal, async_engine
+from src.entities.users import User, UserRole
+from src.auth.service import password_hasher
+
+USERNAME = "benchuser"
+PASSWORD = "Bench@12345!"
+
+
+def create_user():
+    db = SessionLocal()
+    try:
+        if not db.query(User).filter(User.username == USERNAME).first():
+            db.add(User(
+                email="bench@example.com",
+                username=USERNAME,
+                hashed_password=password_hasher.hash_blocking(PASSWORD),
+                role=UserRole.CUSTOMER,
+                is_verified=True
+            ))
+            db.commit()
+    finally:
+        db.close()
+
+
+async def run(logins: int, concurrency: int):
+    transport = httpx.ASGITransport(app=app)
+    semaphore = asyncio.Semaphore(concurrency)
+    probe_latencies = []
+    done = asyncio.Event()
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def login():
+            async with semaphore:
+                response = await client.post("/api/auth/login", data={"username": USERNAME, "password": PASSWORD})
+                response.raise_for_status()
+
+        async def probe():
+            while not done.is_set():
+                started = time.perf_counter()
+                await client.get("/")
+                probe_latencies.append((time.perf_counter() - started) * 1000)
+                await asyncio.sleep(0.01)
+
+        probe_task = asyncio.create_task(probe())
+        started = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(logins)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await probe_task
+
+    await async_engine.dispose()
+    return elapsed, probe_latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Login throughput benchmark")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    create_user()
+    elapsed, probe_latencies = asyncio.run(run(args.logins, args.concurrency))
+    password_hasher.shutdown()
+
+    rate = args.logins / elapsed
+    probe_latencies.sort()
+    p99 = probe_latencies[int(len(probe_latencies) * 0.99) - 1] if probe_latencies else 0.0
+
+    print(f"bcrypt rounds:          {password_hasher.rounds}")
+    print(f"hashing workers:        {password_hasher.max_workers}")
+    print(f"logins:                 {args.logins} in {elapsed:.2f}s")
+    print(f"logins/sec:             {rate:.1f}")
+    print(f"logins/sec per worker:  {rate / password_hasher.max_workers:.1f}")
+    print(f"GET / latency p50/p99:  {probe_latencies[len(probe_latencies) // 2]:.1f}ms / {p99:.1f}ms" if probe_latencies else "")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from src.address.models import AddressResponse, AddressCreate
 from src.auth.service import get_current_user, require_role
 from src.database.core import get_db
 from sqlalchemy.orm import Session
 from src.entities.users import User, UserRole
-from typing import List
+from typing import List, Optional
+from src.pagination import LimitParam, CursorParam, set_next_cursor
 from src.address.service import create_address, list_addresses
 
 router = APIRouter(
@@ -19,5 +20,7 @@ def create_new_address(address: AddressCreate, current_user: User = Depends(requ
     return create_address(address, current_user, db)
 
 @router.get("/", response_model=List[AddressResponse])
-def list_all_address(current_user: User = Depends(require_role([UserRole.SELLER, UserRole.CUSTOMER, UserRole.ADMIN])), db: Session = Depends(get_db)):
-    return list_addresses(current_user, db)
\ No newline at end of file
+def list_all_address(response: Response, current_user: User = Depends(require_role([UserRole.SELLER, UserRole.CUSTOMER, UserRole.ADMIN])), skip: int = 0, limit: int = LimitParam, cursor: Optional[str] = CursorParam, db: Session = Depends(get_db)):
+    addresses, next_cursor = list_addresses(current_user, skip, limit, cursor, db)
+    set_next_cursor(response, next_cursor)
+    return addresses
\ No newline at end of file
@@ -5,6 +5,8 @@ from src.entities.users import User, UserRole
 from fastapi import Depends
 from src.database.core import get_db
 from src.entities.shipping_address import Address
+from src.pagination import paginate, get_page
+from typing import Optional
 
 
 def create_address(address: AddressCreate, current_user: User = Depends(require_role([UserRole.SELLER, UserRole.CUSTOMER, UserRole.ADMIN])), db: Session = Depends(get_db)):
@@ -17,6 +19,8 @@ def create_address(address: AddressCreate, current_user: User = Depends(require_
     return db_address
 
 
-def list_addresses(current_user: User = Depends(require_role([UserRole.SELLER, UserRole.CUSTOMER, UserRole.ADMIN])), db: Session = Depends(get_db)):
+def list_addresses(current_user: User = Depends(require_role([UserRole.SELLER, UserRole.CUSTOMER, UserRole.ADMIN])), skip: int = 0, limit: int = 50, cursor: Optional[str] = None, db: Session = Depends(get_db)):
         
-    return db.query(Address).filter(Address.user_id == current_user.id).all()
+    keys = [Address.id]
+    query = paginate(db.query(Address).filter(Address.user_id == current_user.id), keys, cursor, limit, skip)
+    return get_page(query.all(), keys, limit)
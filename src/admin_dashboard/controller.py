@@ -1,12 +1,13 @@
 from sqlalchemy.orm import Session
 from src.order.models import OrderResponse
 from src.users.models import UserResponse
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from src.entities.users import User, UserRole
-from src.database.core import get_db
+from src.database.core import get_db, get_read_db
 from src.auth.service import require_role
 from typing import List, Optional
-from src.admin_dashboard.service import (get_admin_stat, get_all_order, list_user, get_individual_users, delete_user, get_dashboard_overview)
+from src.pagination import LimitParam, CursorParam, set_next_cursor
+from src.admin_dashboard.service import (get_admin_stat, get_all_order, list_user, get_individual_users, delete_user, get_dashboard_overview, get_health_stats, repair_product_ratings, collect_unused_images)
 
 router = APIRouter(
     tags=["Admin Dashboard"],
@@ -15,39 +16,63 @@ router = APIRouter(
 
 
 @router.get("/dashboard")
-def admin_dashboard(current_user: User = Depends(require_role([UserRole.ADMIN])), db: Session = Depends(get_db)):
+def admin_dashboard(current_user: User = Depends(require_role([UserRole.ADMIN])), db: Session = Depends(get_read_db)):
     
     return get_dashboard_overview(current_user, db)
 
 
+@router.get("/health")
+def get_health(current_user: User = Depends(require_role([UserRole.ADMIN]))):
+
+    return get_health_stats(current_user)
+
+
+@router.post("/ratings/repair")
+def repair_ratings(current_user: User = Depends(require_role([UserRole.ADMIN])), db: Session = Depends(get_db)):
+    """Recompute every product's rating aggregates from its reviews."""
+    return repair_product_ratings(current_user, db)
+
+
+@router.post("/images/gc")
+def collect_images(current_user: User = Depends(require_role([UserRole.ADMIN]))):
+    """Delete stored images that no product or upload references any more."""
+    return collect_unused_images(current_user)
+
+
 @router.get("/stats")
-def get_statistics(current_user: User = Depends(require_role([UserRole.ADMIN])), db: Session = Depends(get_db)):
+def get_statistics(current_user: User = Depends(require_role([UserRole.ADMIN])), db: Session = Depends(get_read_db)):
     
     return get_admin_stat(current_user, db)
 
 
 @router.get("/orders", response_model=List[OrderResponse])
-def get_orders(current_user: User = Depends(require_role([UserRole.ADMIN])), 
+def get_orders(response: Response,
+    current_user: User = Depends(require_role([UserRole.ADMIN])), 
     status: Optional[str] = Query(None, description="Filter by status: pending, processing, shipped, delivered, cancelled"),
     skip: int = 0, 
-    limit: int = 50,
-    db: Session = Depends(get_db)
+    limit: int = LimitParam,
+    cursor: Optional[str] = CursorParam,
+    db: Session = Depends(get_read_db)
 ):
     
-    return get_all_order(current_user, status, skip, limit, db)
+    orders, next_cursor = get_all_order(current_user, status, skip, limit, cursor, db)
+    set_next_cursor(response, next_cursor)
+    return orders
 
 
 @router.get("/users", response_model=List[UserResponse])
-def get_all_users(current_user: User = Depends(require_role([UserRole.ADMIN])), db: Session = Depends(get_db)):
+def get_all_users(response: Response, current_user: User = Depends(require_role([UserRole.ADMIN])), skip: int = 0, limit: int = LimitParam, cursor: Optional[str] = CursorParam, db: Session = Depends(get_read_db)):
     
-    return list_user(current_user, db)
+    users, next_cursor = list_user(current_user, skip, limit, cursor, db)
+    set_next_cursor(response, next_cursor)
+    return users
 
 
 @router.get("/users/{user_id}", response_model=UserResponse)
 def get_user(
     user_id: int,
     current_user: User = Depends(require_role([UserRole.ADMIN])), 
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     
     return get_individual_users(user_id, current_user, db)
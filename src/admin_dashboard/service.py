@@ -4,10 +4,21 @@ from src.entities.products import Product
 from src.entities.order import Order, OrderStatus
 from fastapi import Depends, HTTPException, Response
 from src.entities.users import User, UserRole
-from src.database.core import get_db
+from src.entities.refresh_tokens import RefreshToken
+from src.database.core import get_db, engine, async_engine, replica_engines
+from src.database.pool import get_pool_status
 from typing import Optional
-from src.auth.service import require_role
+from src.auth.service import require_role, principal_cache, password_hasher
 from sqlalchemy import func
+from src.pagination import paginate, get_page
+from src.products.search import product_search
+from src.products.autocomplete import autocomplete
+from src.products.cache import catalog_cache
+from src.review.service import repair_rating_aggregates
+from src.image_processing import image_pipeline
+from src.images.queue import upload_queue
+from src.images.service import collect_orphans, release_user_images
+from src.images.cache import resize_cache
 
 
 def get_dashboard_overview(current_user: User = Depends(require_role(UserRole.ADMIN)), db: Session = Depends(get_db)):
@@ -133,7 +144,7 @@ def get_admin_stat(current_user: User = Depends(require_role([UserRole.ADMIN])),
     }
 
 
-def get_all_order(current_user: User = Depends(require_role([UserRole.ADMIN])), status: Optional[str] = None, skip: int = 0, limit: int = 50, db: Session = Depends(get_db)):
+def get_all_order(current_user: User = Depends(require_role([UserRole.ADMIN])), status: Optional[str] = None, skip: int = 0, limit: int = 50, cursor: Optional[str] = None, db: Session = Depends(get_db)):
     
     query = db.query(Order)
     
@@ -144,13 +155,15 @@ def get_all_order(current_user: User = Depends(require_role([UserRole.ADMIN])),
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid status")
     
-    return query.order_by(Order.created_at.desc()).offset(skip).limit(limit).all()
+    keys = [Order.created_at, Order.id]
+    return get_page(paginate(query, keys, cursor, limit, skip, descending=True).all(), keys, limit)
 
 
 
-def list_user(current_user: User = Depends(require_role([UserRole.ADMIN])), db: Session = Depends(get_db)):
-    user = db.query(User).all()
-    return user
+def list_user(current_user: User = Depends(require_role([UserRole.ADMIN])), skip: int = 0, limit: int = 50, cursor: Optional[str] = None, db: Session = Depends(get_db)):
+    keys = [User.id]
+    user = paginate(db.query(User), keys, cursor, limit, skip).all()
+    return get_page(user, keys, limit)
 
 
 def get_individual_users(
@@ -178,9 +191,40 @@ def delete_user(user_id: int, current_user: User = Depends(require_role([UserRol
     if user_query == None:
         raise HTTPException(status_code=404, detail="user not found")
     
+    db.query(RefreshToken).filter(RefreshToken.user_id == user_id).delete(synchronize_session=False)
+    release_user_images(user_id, db)
     user.delete(synchronize_session=False)
 
     db.commit()
+    principal_cache.invalidate(user_id)
     
     return Response(status_code=204)
 
+
+def get_health_stats(current_user: User = Depends(require_role([UserRole.ADMIN]))):
+
+    return {
+        "database": {
+            "pool": get_pool_status(engine),
+            "async_pool": get_pool_status(async_engine),
+            "replica_pools": [get_pool_status(replica) for replica in replica_engines]
+        },
+        "principal_cache": principal_cache.stats(),
+        "catalog_cache": catalog_cache.stats(),
+        "product_search": product_search.stats(),
+        "autocomplete": autocomplete.stats(),
+        "image_pipeline": image_pipeline.stats(),
+        "upload_queue": upload_queue.stats(),
+        "resize_cache": resize_cache.stats(),
+        "password_hasher": password_hasher.stats()
+    }
+
+
+def repair_product_ratings(current_user: User = Depends(require_role([UserRole.ADMIN])), db: Session = Depends(get_db)):
+
+    return repair_rating_aggregates(db)
+
+
+def collect_unused_images(current_user: User = Depends(require_role([UserRole.ADMIN]))):
+
+    return {"removed": collect_orphans()}
@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi import APIRouter, Depends, status, HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from src.database.core import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.database.core import get_db, get_async_db
 from src.entities.users import User
 from pydantic import EmailStr 
 from fastapi.security import OAuth2PasswordRequestForm
-from src.auth.service import verify_password, create_access_token, get_hashed_password
-from src.auth.models import Token, UserCreate, EmailVerificationResponse
+from src.auth.service import password_hasher, principal_cache, new_refresh_token, create_token_pair, rotate_refresh_token, revoke_refresh_token
+from src.auth.models import Token, UserCreate, EmailVerificationResponse, RefreshRequest
 from src.email.service import create_verification_token, send_verification_email
 
 
@@ -24,7 +27,7 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail="Email or username already registered")
     
     verification_token = create_verification_token()
-    hashed_password = get_hashed_password(user.password)
+    hashed_password = password_hasher.hash_blocking(user.password)
     
     db_user = User(
         email=user.email,
@@ -56,8 +59,8 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/verify-email", response_model=EmailVerificationResponse)
-async def verify_email(token: str, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.verification_token == token).first()
+async def verify_email(token: str, db: AsyncSession = Depends(get_async_db)):
+    user = await db.scalar(select(User).where(User.verification_token == token))
     
     if not user:
         raise HTTPException(status_code=400, detail="Invalid verification token")
@@ -67,14 +70,15 @@ async def verify_email(token: str, db: Session = Depends(get_db)):
     
     user.is_verified = True
     user.verification_token = None
-    db.commit()
+    await db.commit()
+    principal_cache.invalidate(user.id)
     
     return EmailVerificationResponse(message="Email verified successfully! You can now login.", email=user.email, status="verified")
 
 @router.post("/resend-verification", response_model=EmailVerificationResponse)
-async def resend_verification(email: EmailStr, db: Session = Depends(get_db)):
+async def resend_verification(email: EmailStr, db: AsyncSession = Depends(get_async_db)):
     
-    user = db.query(User).filter(User.email == email.lower()).first()
+    user = await db.scalar(select(User).where(User.email == email.lower()))
     
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -84,9 +88,9 @@ async def resend_verification(email: EmailStr, db: Session = Depends(get_db)):
     
     new_token = create_verification_token()
     user.verification_token = new_token
-    db.commit()
+    await db.commit()
     
-    email_result = send_verification_email(user.email, new_token)
+    email_result = await run_in_threadpool(send_verification_email, user.email, new_token)
     
     if email_result["success"]:
         return EmailVerificationResponse(message="Verification email resent!", email=user.email, status="email_resent")
@@ -101,21 +105,38 @@ async def resend_verification(email: EmailStr, db: Session = Depends(get_db)):
 @router.post("/login", response_model=Token)
 async def login_user(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = db.query(User).filter(User.username == form_data.username).first()
+    user = await db.scalar(select(User).where(User.username == form_data.username))
 
     if not user:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid Credentials")
 
-    if not verify_password(form_data.password, user.hashed_password):
+    if not await password_hasher.verify(form_data.password, user.hashed_password):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid Credentials")
 
-    access_token = create_access_token(
-        data={"id": user.id, "role": user.role}
-    )
+    if password_hasher.needs_rehash(user.hashed_password):
+        user.hashed_password = await password_hasher.hash(form_data.password)
+
+    refresh_token, record = new_refresh_token(user.id)
+    db.add(record)
+    await db.commit()
+
+    return create_token_pair(user, refresh_token)
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh_access_token(body: RefreshRequest, db: AsyncSession = Depends(get_async_db)):
+
+    return await rotate_refresh_token(body.refresh_token, db)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(body: RefreshRequest, db: AsyncSession = Depends(get_async_db)):
+
+    await revoke_refresh_token(body.refresh_token, db)
 
-    return {"access_token": access_token, "token_type": "bearer"}
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
     
 
 
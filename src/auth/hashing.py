@@ -0,0 +1,106 @@
+import asyncio
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import bcrypt
+from fastapi import HTTPException, status
+
+
+def hash_password(password: str, rounds: int) -> str:
+    prehash = hashlib.sha256(password.encode('utf-8')).hexdigest()
+    salt = bcrypt.gensalt(rounds=rounds)
+    hashed = bcrypt.hashpw(prehash.encode('utf-8'), salt)
+
+    return hashed.decode('utf-8')
+
+
+def check_password(plain_password: str, hashed_password: str) -> bool:
+    prehash = hashlib.sha256(plain_password.encode('utf-8')).hexdigest()
+    return bcrypt.checkpw(prehash.encode('utf-8'), hashed_password.encode('utf-8'))
+
+
+def get_hash_rounds(hashed_password: str) -> int:
+    # bcrypt hashes look like $2b$12$<salt+hash>
+    try:
+        return int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return 0
+
+
+class PasswordHasher:
+    """Runs bcrypt on a bounded thread pool instead of the caller's thread.
+
+    bcrypt releases the GIL while hashing, so threads give real
+    parallelism. At most max_workers hashes run at once and at most
+    max_queue more may wait; anything beyond that is rejected with a 503
+    rather than queueing without bound.
+    """
+
+    def __init__(self, rounds: int = 12, max_workers: int = None, max_queue: int = 64):
+        self.rounds = rounds
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bcrypt")
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.peak_queue_depth = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _run(self, fn, *args):
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+
+    def _submit(self, fn, *args):
+        with self._lock:
+            if self.queued >= self.max_queue:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Server is busy, please retry",
+                    headers={"Retry-After": "1"}
+                )
+            self.queued += 1
+            self.peak_queue_depth = max(self.peak_queue_depth, self.queued)
+
+        return self._executor.submit(self._run, fn, *args)
+
+    async def hash(self, password: str) -> str:
+        return await asyncio.wrap_future(self._submit(hash_password, password, self.rounds))
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await asyncio.wrap_future(self._submit(check_password, plain_password, hashed_password))
+
+    def hash_blocking(self, password: str) -> str:
+        return self._submit(hash_password, password, self.rounds).result()
+
+    def verify_blocking(self, plain_password: str, hashed_password: str) -> bool:
+        return self._submit(check_password, plain_password, hashed_password).result()
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        return get_hash_rounds(hashed_password) != self.rounds
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "rounds": self.rounds,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self.running,
+                "queue_depth": self.queued,
+                "peak_queue_depth": self.peak_queue_depth,
+                "completed": self.completed,
+                "rejected": self.rejected
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -107,6 +107,12 @@ class UserResponse(BaseModel):
 class Token(BaseModel):
     access_token: str
     token_type : str
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
 
 
 class TokenData(BaseModel):
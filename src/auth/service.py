@@ -1,46 +1,69 @@
-import bcrypt
+import hmac
 import hashlib
+import secrets
+import uuid
 from fastapi import HTTPException, status, Depends
 import jwt
+from sqlalchemy import select, update
 from src.entities.users import User, UserRole
-from dotenv import dotenv_values
+from src.entities.refresh_tokens import RefreshToken
 from datetime import datetime, timedelta
 from src.auth.models import TokenData
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import OAuth2PasswordBearer
 from typing import Optional, List
-from src.database.core import get_db
+from src.database.core import get_async_db
+from src.settings import get_settings
+from src.cache import TTLCache
+from src.auth.hashing import PasswordHasher, hash_password, check_password
 
 
 oauth_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
-config = dotenv_values(".env")
+settings = get_settings()
+
+# Authenticated users keyed by id. Entries are detached ORM objects, so
+# handlers must treat current_user as read-only and reload it to modify it.
+principal_cache = TTLCache(
+    max_size=settings.principal_cache_max_size,
+    ttl_seconds=settings.principal_cache_ttl_seconds
+)
+
+
+password_hasher = PasswordHasher(
+    rounds=settings.bcrypt_rounds,
+    max_workers=settings.password_hash_workers,
+    max_queue=settings.password_hash_max_queue
+)
 
 
 def get_hashed_password(password: str):
-    
-    prehash = hashlib.sha256(password.encode('utf-8')).hexdigest()
-    salt = bcrypt.gensalt(rounds=12)
-    hashed = bcrypt.hashpw(prehash.encode('utf-8'), salt)
 
-    return hashed.decode('utf-8')
+    return hash_password(password, password_hasher.rounds)
 
 
 def verify_password(plain_password: str, hashed_password: str):
-    prehash = hashlib.sha256(plain_password.encode('utf-8')).hexdigest()
-    return bcrypt.checkpw(prehash.encode('utf-8'), hashed_password.encode('utf-8'))
+    return check_password(plain_password, hashed_password)
+
+
+invalid_refresh_token = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Invalid refresh token",
+    headers={"WWW-Authenticate": "Bearer"}
+)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
+    current_settings = get_settings()
     to_encode = data.copy()
     
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(hours=24)
+        expire = datetime.utcnow() + timedelta(minutes=current_settings.access_token_expire_minutes)
     
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, config["SECRET"], algorithm=config["ALGORITHM"])
+    encoded_jwt = jwt.encode(to_encode, current_settings.secret, algorithm=current_settings.algorithm)
 
     return encoded_jwt
 
@@ -48,7 +71,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 def verify_token(token: str) :
 
     try:
-        payload = jwt.decode(token, config["SECRET"], algorithms=[config["ALGORITHM"]])
+        current_settings = get_settings()
+        payload = jwt.decode(token, current_settings.secret, algorithms=[current_settings.algorithm])
         
         user_id: str = payload.get("id")
         
@@ -71,17 +95,105 @@ def verify_token(token: str) :
         )
     
 
-def get_current_user(token: str = Depends(oauth_scheme), db: Session = Depends(get_db)):
+def hash_refresh_token(token: str) -> str:
+    return hmac.new(get_settings().secret.encode('utf-8'), token.encode('utf-8'), hashlib.sha256).hexdigest()
+
+
+def new_refresh_token(user_id: int, family_id: Optional[str] = None):
+    token = secrets.token_urlsafe(48)
+    record = RefreshToken(
+        user_id=user_id,
+        token_hash=hash_refresh_token(token),
+        family_id=family_id or str(uuid.uuid4()),
+        expires_at=datetime.utcnow() + timedelta(days=get_settings().refresh_token_expire_days)
+    )
+
+    return token, record
+
+
+def create_token_pair(user: User, refresh_token: str) -> dict:
+    return {
+        "access_token": create_access_token(data={"id": user.id, "role": user.role}),
+        "token_type": "bearer",
+        "refresh_token": refresh_token,
+        "expires_in": get_settings().access_token_expire_minutes * 60
+    }
+
+
+async def revoke_token_family(db: AsyncSession, family_id: str):
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+    )
+
+
+async def rotate_refresh_token(refresh_token: str, db: AsyncSession) -> dict:
+    row = (await db.execute(
+        select(RefreshToken, User)
+        .join(User, User.id == RefreshToken.user_id)
+        .where(RefreshToken.token_hash == hash_refresh_token(refresh_token))
+    )).first()
+
+    if not row:
+        raise invalid_refresh_token
+
+    record, user = row
+
+    if record.revoked_at is not None:
+        # A rotated token being presented again means it leaked; cut off the
+        # whole chain so neither the thief nor the owner can keep using it.
+        await revoke_token_family(db, record.family_id)
+        await db.commit()
+        raise invalid_refresh_token
+
+    if record.expires_at <= datetime.utcnow() or not user.is_active:
+        raise invalid_refresh_token
+
+    token, replacement = new_refresh_token(user.id, record.family_id)
+    db.add(replacement)
+    await db.flush()
+
+    record.revoked_at = datetime.utcnow()
+    record.replaced_by_id = replacement.id
+    await db.commit()
+
+    return create_token_pair(user, token)
+
+
+async def revoke_refresh_token(refresh_token: str, db: AsyncSession):
+    record = await db.scalar(
+        select(RefreshToken).where(RefreshToken.token_hash == hash_refresh_token(refresh_token))
+    )
+    if record:
+        await revoke_token_family(db, record.family_id)
+        await db.commit()
+
+
+async def get_current_user(token: str = Depends(oauth_scheme), db: AsyncSession = Depends(get_async_db)):
 
     token_data = verify_token(token)
+    user_id = int(token_data.id)
+
+    user = principal_cache.get(user_id)
+    if user is not None:
+        return user
+
+    user = await db.get(User, user_id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
 
-    user = db.query(User).filter(User.id == int(token_data.id)).first()
+    principal_cache.set(user_id, user)
 
     return user
 
 
 def require_role(allowed_roles: List[UserRole]):
-    def role_checker(current_user: User = Depends(get_current_user)):
+    async def role_checker(current_user: User = Depends(get_current_user)):
         if current_user.role not in allowed_roles:
             raise HTTPException(status_code=403, detail="Insufficient permissions")
         return current_user
@@ -90,7 +202,7 @@ def require_role(allowed_roles: List[UserRole]):
 
 
 
-def require_verified(current_user: User = Depends(get_current_user)):
+async def require_verified(current_user: User = Depends(get_current_user)):
     if not current_user.is_verified:
         raise HTTPException(
             status_code=403, 
@@ -2,7 +2,8 @@ from fastapi import APIRouter, Depends
 from src.cart_items.models import CartItemResponse, CartItemCreate
 from src.cart_items.service import add_to_cart, get_cart, update_cart_item, remove_from_cart
 from sqlalchemy.orm import Session
-from src.database.core import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.database.core import get_db, get_async_read_db
 from src.entities.users import User, UserRole
 from typing import List
 from src.auth.service import get_current_user, require_role
@@ -19,9 +20,9 @@ def add_to_carts(item: CartItemCreate, current_user: User = Depends(require_role
     return add_to_cart(item, current_user, db)
 
 @router.get("/", response_model=List[CartItemResponse])
-def get_all_cart(current_user: User = Depends(require_role([UserRole.SELLER, UserRole.CUSTOMER, UserRole.ADMIN])), db: Session = Depends(get_db)):
+async def get_all_cart(current_user: User = Depends(require_role([UserRole.SELLER, UserRole.CUSTOMER, UserRole.ADMIN])), db: AsyncSession = Depends(get_async_read_db)):
 
-    return get_cart(current_user, db)
+    return await get_cart(current_user, db)
 
 @router.put("/{item_id}", response_model=CartItemResponse)
 def update_cart_items(item_id: int, quantity: int, current_user: User = Depends(require_role([UserRole.SELLER, UserRole.CUSTOMER, UserRole.ADMIN])), 
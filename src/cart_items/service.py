@@ -1,11 +1,13 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.cart_items.models import CartItemCreate
 from src.entities.carts import CartItem
 from src.entities.users import User, UserRole
 from src.entities.products import Product
 from fastapi import HTTPException, Depends, Response, status
 from src.auth.service import require_role
-from src.database.core import get_db
+from src.database.core import get_db, get_async_db
 
 def add_to_cart(item: CartItemCreate, current_user: User = Depends(require_role([UserRole.SELLER, UserRole.CUSTOMER, UserRole.ADMIN])), db: Session = Depends(get_db)):
 
@@ -32,10 +34,14 @@ def add_to_cart(item: CartItemCreate, current_user: User = Depends(require_role(
     return cart_item
 
 
-def get_cart(current_user: User = Depends(require_role([UserRole.SELLER, UserRole.CUSTOMER, UserRole.ADMIN])), db: Session = Depends(get_db)):
+async def get_cart(current_user: User = Depends(require_role([UserRole.SELLER, UserRole.CUSTOMER, UserRole.ADMIN])), db: AsyncSession = Depends(get_async_db)):
     
-    cart = db.query(CartItem).filter(CartItem.user_id == current_user.id).all()
-    return cart
+    cart = await db.scalars(
+        select(CartItem)
+        .where(CartItem.user_id == current_user.id)
+        .options(selectinload(CartItem.product))
+    )
+    return cart.all()
 
 
 
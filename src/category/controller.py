@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.orm import Session
 from src.category.models import CategoryResponse, CategoryCreate
 from src.category.service import create_category, list_category, delete_category, update_category
@@ -7,6 +7,7 @@ from src.users.models import UserRole
 from src.auth.service import require_role, get_current_user
 from src.database.core import get_db
 from typing import List
+from src.http_cache import not_modified, etag_for, CATEGORY_CACHE_CONTROL
 
 
 router = APIRouter(
@@ -24,10 +25,10 @@ def create_categories(category: CategoryCreate, current_user: User = Depends(req
     return data
 
 @router.get("/", response_model=List[CategoryResponse])
-def list_categories(current_user: User = Depends(require_role([UserRole.SELLER, UserRole.ADMIN])), db: Session = Depends(get_db)):
+def list_categories(request: Request, response: Response, current_user: User = Depends(require_role([UserRole.SELLER, UserRole.ADMIN])), db: Session = Depends(get_db)):
     data = list_category(current_user, db=db)
 
-    return data
+    return not_modified(request, response, etag_for(data), CATEGORY_CACHE_CONTROL) or data
 
 
 @router.put("/{category_id}", response_model=CategoryResponse)
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from typing import Optional
+from datetime import datetime
 
 
 class CategoryCreate(BaseModel):
@@ -11,6 +12,7 @@ class CategoryResponse(BaseModel):
     id: int
     name: str
     description: Optional[str]
+    updated_at: Optional[datetime] = None
     
     class Config:
         from_attributes = True
\ No newline at end of file
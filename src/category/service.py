@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 from src.database.core import get_db
 from src.auth.service import require_role
 from src.users.models import UserRole
+from src.products.autocomplete import autocomplete, CATEGORY
 
 
 def create_category(category: CategoryCreate, current_user: User = Depends(require_role([UserRole.SELLER, UserRole.ADMIN])), 
@@ -14,12 +15,13 @@ def create_category(category: CategoryCreate, current_user: User = Depends(requi
     db.add(db_category)
     db.commit()
     db.refresh(db_category)
+    autocomplete.upsert(CATEGORY, db_category.id, db_category.name, 0)
 
     return db_category
 
 
 def list_category(current_user: User = Depends(require_role([UserRole.SELLER, UserRole.CUSTOMER, UserRole.ADMIN])), db: Session = Depends(get_db)):
-    return db.query(Category).all()
+    return db.query(Category).order_by(Category.id).all()
 
 
 def update_category(category_id: int, category: CategoryCreate, 
@@ -32,6 +34,7 @@ def update_category(category_id: int, category: CategoryCreate,
     db_category.description = category.description
     db.commit()
     db.refresh(db_category)
+    autocomplete.upsert(CATEGORY, db_category.id, db_category.name)
 
     return db_category
 
@@ -46,5 +49,6 @@ def delete_category(category_id: int, current_user: User = Depends(require_role(
     
     db.delete(db_category)
     db.commit()
+    autocomplete.remove(CATEGORY, category_id)
     
     return Response(status_code=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
@@ -1,17 +1,18 @@
+from sqlalchemy import inspect, text
 from sqlalchemy.orm import Session
+from src.database.core import Base
 from src.entities.users import User, UserRole
-from src.auth.service import get_hashed_password
-from dotenv import dotenv_values
-
-config = dotenv_values(".env")
+from src.auth.service import password_hasher
+from src.settings import get_settings
 
 
 def create_default_admin(db: Session) -> User | None:
     
     
-    admin_email = config.get("ADMIN_EMAIL", "admin@ecommerce.com")
-    admin_password = config.get("ADMIN_PASSWORD", "Admin@123456!")
-    admin_username = config.get("ADMIN_USERNAME", "admin")
+    settings = get_settings()
+    admin_email = settings.admin_email
+    admin_password = settings.admin_password
+    admin_username = settings.admin_username
     
     
     existing_admin = db.query(User).filter(User.role == UserRole.ADMIN).first()
@@ -33,7 +34,7 @@ def create_default_admin(db: Session) -> User | None:
     admin_user = User(
         email=admin_email,
         username=admin_username,
-        hashed_password=get_hashed_password(admin_password),
+        hashed_password=password_hasher.hash_blocking(admin_password),
         full_name="System Administrator",
         role=UserRole.ADMIN,
         is_active=True,
@@ -53,6 +54,60 @@ def create_default_admin(db: Session) -> User | None:
     return admin_user
 
 
+def add_missing_columns(bind):
+    # create_all() never alters an existing table, so columns added to a
+    # model later are added here. They need a server default or must be
+    # nullable for the existing rows. Returns the (table, column) pairs added.
+    inspector = inspect(bind)
+    tables = set(inspector.get_table_names())
+    ddl_compiler = bind.dialect.ddl_compiler(bind.dialect, None)
+
+    added = []
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in tables:
+                continue
+
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    spec = ddl_compiler.get_column_specification(column)
+                    conn.execute(text(f"ALTER TABLE {ddl_compiler.preparer.format_table(table)} ADD COLUMN {spec}"))
+                    added.append((table.name, column.name))
+
+    return added
+
+
+def drop_stale_not_null(bind):
+    # Columns made nullable in a model keep NOT NULL in existing tables.
+    # PostgreSQL can drop it in place; SQLite cannot alter a column.
+    if bind.dialect.name != "postgresql":
+        return
+
+    inspector = inspect(bind)
+    tables = set(inspector.get_table_names())
+    preparer = bind.dialect.identifier_preparer
+
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in tables:
+                continue
+
+            existing = {column["name"]: column for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                info = existing.get(column.name)
+                if info is not None and column.nullable and not info["nullable"]:
+                    conn.execute(text(f"ALTER TABLE {preparer.format_table(table)} ALTER COLUMN {preparer.format_column(column)} DROP NOT NULL"))
+
+
+def create_missing_indexes(bind):
+    # create_all() skips tables that already exist, so indexes added to an
+    # existing table have to be created separately.
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
+
+
 def init_db(db: Session):
     
     print("\n Initializing database...")
@@ -1,25 +1,184 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from dotenv import dotenv_values
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+from src.database.pool import InstrumentedQueuePool, InstrumentedAsyncQueuePool
+from src.database.routing import RoutingSession, PrimaryPins
+from src.settings import get_settings
 
 
-config = dotenv_values(".env")
+settings = get_settings()
 
-SQLALCHEMY_DATABASE_URL = f"postgresql://{config["DATABASE_USERNAME"]}:{config["DATABASE_PASSWORD"]}@{config["DATABASE_HOSTNAME"]}/{config["DATABASE_NAME"]}"
+SQLITE_MEMORY_URL = "sqlite:///file:ecommerce?mode=memory&cache=shared&uri=true"
 
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+def get_database_url() -> str:
+    if settings.database_url:
+        return settings.database_url
+
+    if all([settings.database_username, settings.database_password, settings.database_hostname, settings.database_name]):
+        return f"postgresql://{settings.database_username}:{settings.database_password}@{settings.database_hostname}/{settings.database_name}"
+
+    return "sqlite:///./ecommerce.db"
+
+
+def is_sqlite_memory(url) -> bool:
+    return url.get_backend_name() == "sqlite" and (
+        url.database in (None, "", ":memory:") or url.query.get("mode") == "memory"
+    )
+
+
+def normalize_database_url(url: str) -> str:
+    parsed = make_url(url)
+
+    # A plain :memory: database is private to one connection, so the sync and
+    # async engines would each see an empty schema. Use a named shared-cache
+    # database instead so every connection in the process sees the same data.
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return SQLITE_MEMORY_URL
+
+    return url
+
+
+SQLALCHEMY_DATABASE_URL = normalize_database_url(get_database_url())
+
+REPLICA_DATABASE_URLS = [normalize_database_url(url) for url in settings.replica_urls]
+
+
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def get_async_database_url(url: str) -> str:
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend '{backend}'")
+
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def get_engine_options(url: str, is_async: bool = False) -> dict:
+    parsed = make_url(url)
+
+    if is_sqlite_memory(parsed):
+        return {
+            "poolclass": StaticPool,
+            "connect_args": {"check_same_thread": False}
+        }
+
+    options = {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+    if parsed.get_backend_name() == "sqlite":
+        options["connect_args"] = {"check_same_thread": False}
+        return options
+
+    statement_timeout_ms = settings.db_statement_timeout_ms
+    if statement_timeout_ms > 0:
+        if is_async:
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(statement_timeout_ms)}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={statement_timeout_ms}"}
+
+    return options
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.db_pool_timeout * 1000)}")
+    cursor.close()
+
+
+def build_engine(url: str):
+    db_engine = create_engine(url, **get_engine_options(url))
+    if db_engine.dialect.name == "sqlite":
+        event.listen(db_engine, "connect", _set_sqlite_pragmas)
+    return db_engine
+
+
+def build_async_engine(url: str):
+    db_engine = create_async_engine(get_async_database_url(url), **get_engine_options(url, is_async=True))
+    if db_engine.dialect.name == "sqlite":
+        event.listen(db_engine.sync_engine, "connect", _set_sqlite_pragmas)
+    return db_engine
+
+
+engine = build_engine(SQLALCHEMY_DATABASE_URL)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = build_async_engine(SQLALCHEMY_DATABASE_URL)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+replica_engines = [build_engine(url) for url in REPLICA_DATABASE_URLS]
+
+async_replica_engines = [build_async_engine(url) for url in REPLICA_DATABASE_URLS]
+
+ReadSessionLocal = sessionmaker(
+    class_=RoutingSession,
+    autocommit=False,
+    autoflush=False,
+    primary=engine,
+    replicas=replica_engines
+)
+
+AsyncReadSessionLocal = async_sessionmaker(
+    sync_session_class=RoutingSession,
+    autoflush=False,
+    expire_on_commit=False,
+    primary=async_engine.sync_engine,
+    replicas=[replica.sync_engine for replica in async_replica_engines]
+)
+
+primary_pins = PrimaryPins(settings.secret, window_seconds=settings.primary_pin_seconds)
+
 Base = declarative_base()
 
 
+@event.listens_for(Session, "after_commit")
+def _mark_committed(session):
+    # Pin as soon as the write commits, while the response can still carry
+    # the cookie: dependency teardown runs only after it is sent.
+    if session.info.get("pins_primary"):
+        primary_pins.pin()
+
+
 def get_db():
-    db = SessionLocal()
+    db = SessionLocal(info={"pins_primary": True})
     try:
         yield db
     finally:
         db.close()
-        
\ No newline at end of file
+
+
+async def get_async_db():
+    async with AsyncSessionLocal(info={"pins_primary": True}) as db:
+        yield db
+
+
+def get_read_db():
+    db = ReadSessionLocal(use_primary=primary_pins.is_pinned())
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db():
+    async with AsyncReadSessionLocal(use_primary=primary_pins.is_pinned()) as db:
+        yield db
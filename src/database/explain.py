@@ -0,0 +1,280 @@
+"""EXPLAIN regression harness for the hot service queries.
+
+Seeds a throwaway database with a large dataset, runs the service
+functions behind the busiest endpoints, captures every ORM statement they
+execute and fails if any of them plans a sequential scan.
+
+    python -m src.database.explain --url sqlite:///./explain.db --scale 20000
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from fastapi import HTTPException, Response
+from sqlalchemy import event, insert, text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from src.database import create_missing_indexes
+from src.database.core import Base, build_engine, build_async_engine
+from src.entities.users import User, UserRole
+from src.entities.category import Category
+from src.entities.products import Product
+from src.entities.carts import CartItem
+from src.entities.shipping_address import Address
+from src.entities.order import Order, OrderItem, OrderStatus
+from src.entities.payments import Payment, PaymentStatus
+from src.entities.reviews import Review
+from src.entities import images
+from src.cart_items.models import CartItemCreate
+from src.cart_items import service as cart_service
+from src.products import service as product_service
+from src.products.models import ProductFilters, ProductSort
+from src.review.models import ReviewSort
+from src.products.cache import catalog_cache
+from src.order import service as order_service
+from src.address import service as address_service
+from src.payment import service as payment_service
+from src.admin_dashboard import service as admin_service
+from src import sellers
+from src.pagination import encode_cursor
+
+
+class Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, "sqlite")
+def _explain_sqlite(element, compiler, **kw):
+    return "EXPLAIN QUERY PLAN " + compiler.process(element.statement, **kw)
+
+
+@compiles(Explain, "postgresql")
+def _explain_postgresql(element, compiler, **kw):
+    return "EXPLAIN " + compiler.process(element.statement, **kw)
+
+
+def find_sequential_scans(dialect_name: str, plan_rows) -> list:
+    if dialect_name == "sqlite":
+        details = [row[-1] for row in plan_rows]
+        return [
+            detail for detail in details
+            if detail.startswith("SCAN ") and "USING" not in detail and "CONSTANT ROW" not in detail
+        ]
+
+    return [row[0].strip() for row in plan_rows if "Seq Scan" in row[0]]
+
+
+def seed(engine, scale: int):
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    n_users = max(scale // 10, 10)
+    n_categories = 50
+    n_products = scale
+    n_orders = scale
+
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {
+                "id": i,
+                "email": f"user{i}@example.com",
+                "username": f"user{i}",
+                "hashed_password": "x",
+                "role": UserRole.SELLER if i % 10 == 0 else UserRole.CUSTOMER,
+                "is_active": True,
+                "is_verified": True,
+                "created_at": now - timedelta(minutes=i)
+            }
+            for i in range(1, n_users + 1)
+        ])
+        conn.execute(insert(Category), [{"id": i, "name": f"Category {i}"} for i in range(1, n_categories + 1)])
+        conn.execute(insert(Product), [
+            {
+                "id": i,
+                "name": f"Product {i}",
+                "description": "Seeded product",
+                "price": round(rng.uniform(1, 500), 2),
+                "stock": rng.randint(0, 200),
+                "category_id": rng.randint(1, n_categories),
+                "seller_id": rng.randrange(10, n_users + 1, 10),
+                "is_active": i % 20 != 0,
+                "created_at": now - timedelta(minutes=i)
+            }
+            for i in range(1, n_products + 1)
+        ])
+        conn.execute(insert(Address), [
+            {"id": i, "user_id": i, "street": "1 Main St", "city": "City", "state": "State", "postal_code": "00000", "country": "NG"}
+            for i in range(1, n_users + 1)
+        ])
+        conn.execute(insert(CartItem), [
+            {"user_id": rng.randint(1, n_users), "product_id": rng.randint(1, n_products), "quantity": 1, "created_at": now}
+            for _ in range(scale)
+        ])
+        orders = []
+        for i in range(1, n_orders + 1):
+            customer_id = rng.randint(1, n_users)
+            orders.append({
+                "id": i,
+                "customer_id": customer_id,
+                "total_amount": 10.0,
+                "status": rng.choice(list(OrderStatus)),
+                "shipping_address_id": customer_id,
+                "created_at": now - timedelta(minutes=i)
+            })
+        conn.execute(insert(Order), orders)
+        conn.execute(insert(OrderItem), [
+            {"order_id": i, "product_id": rng.randint(1, n_products), "quantity": 1, "price": 10.0}
+            for i in range(1, n_orders + 1)
+            for _ in range(2)
+        ])
+        conn.execute(insert(Payment), [
+            {
+                "order_id": i,
+                "amount": 10.0,
+                "payment_method": "credit_card",
+                "payment_status": PaymentStatus.COMPLETED,
+                "transaction_id": f"txn-{i}",
+                "created_at": now
+            }
+            for i in range(1, n_orders + 1, 2)
+        ])
+        conn.execute(insert(Review), [
+            {"product_id": rng.randint(1, n_products), "user_id": rng.randint(1, n_users), "rating": rng.randint(1, 5), "created_at": now}
+            for _ in range(scale)
+        ])
+        conn.execute(text("ANALYZE"))
+
+
+def build_scenarios(product_id: int, order_id: int):
+    def sync(fn):
+        return ("sync", fn)
+
+    def run_async(fn):
+        return ("async", fn)
+
+    return {
+        "get_product": run_async(lambda db, users: product_service.get_product(product_id, users["customer"], db)),
+        "list_products": run_async(lambda db, users: product_service.list_products(users["customer"], limit=50, db=db)),
+        "list_products_page": run_async(lambda db, users: product_service.list_products(users["customer"], limit=50, cursor=encode_cursor([product_id * 100]), db=db)),
+        "list_products_newest": run_async(lambda db, users: product_service.list_products(users["customer"], sort=ProductSort.NEWEST, db=db)),
+        "list_products_popular": run_async(lambda db, users: product_service.list_products(users["customer"], cursor=encode_cursor([5, product_id]), sort=ProductSort.POPULARITY, db=db)),
+        "list_products_category": run_async(lambda db, users: product_service.list_products(
+            users["customer"], filters=ProductFilters(category_id=1, max_price=100, in_stock=True), sort=ProductSort.PRICE_ASC, db=db
+        )),
+        "product_facets": run_async(lambda db, users: product_service.get_product_facets(ProductFilters(category_id=1), users["customer"], db)),
+        "get_cart": run_async(lambda db, users: cart_service.get_cart(users["customer"], db)),
+        "list_orders": run_async(lambda db, users: order_service.list_orders(users["customer"], db=db)),
+        "list_orders_page": run_async(lambda db, users: order_service.list_orders(users["customer"], cursor=encode_cursor([datetime.utcnow(), order_id]), db=db)),
+        "add_to_cart": sync(lambda db, users: cart_service.add_to_cart(CartItemCreate(product_id=product_id, quantity=1), users["customer"], db)),
+        "get_order": sync(lambda db, users: order_service.get_order(order_id, users["customer"], db)),
+        "list_addresses": sync(lambda db, users: address_service.list_addresses(users["customer"], db=db)),
+        "get_payment_by_order": sync(lambda db, users: payment_service.get_payment_by_order(order_id, users["admin"], db)),
+        "get_product_review": sync(lambda db, users: product_service.get_product_review(product_id, users["customer"], limit=50, db=db)),
+        "product_reviews_page": sync(lambda db, users: product_service.get_product_review(product_id, users["customer"], limit=50, cursor=encode_cursor([5, product_id]), sort=ReviewSort.HIGHEST, db=db)),
+        "admin_orders_by_status": sync(lambda db, users: admin_service.get_all_order(users["admin"], "pending", limit=50, db=db)),
+        "admin_orders_page": sync(lambda db, users: admin_service.get_all_order(users["admin"], None, limit=50, cursor=encode_cursor([datetime.utcnow(), order_id]), db=db)),
+        "admin_users_page": sync(lambda db, users: admin_service.list_user(users["admin"], limit=50, cursor=encode_cursor([users["customer"].id]), db=db)),
+        "payments_page": sync(lambda db, users: payment_service.get_all_payment(users["admin"], limit=50, cursor=encode_cursor([order_id]), db=db)),
+        "seller_products": sync(lambda db, users: sellers.get_seller_products(Response(), users["seller"], 0, 50, None, db)),
+        "seller_orders": sync(lambda db, users: sellers.get_seller_orders(users["seller"], db)),
+        "seller_stats": sync(lambda db, users: sellers.get_seller_stats(users["seller"], db)),
+    }
+
+
+async def run_scenarios(engine, async_engine, scenarios: dict, user_ids: dict) -> dict:
+    SyncSession = sessionmaker(bind=engine, autoflush=False)
+    AsyncSession = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    captured = []
+
+    def capture(orm_execute_state):
+        captured.append((orm_execute_state.statement, dict(orm_execute_state.parameters or {})))
+
+    event.listen(Session, "do_orm_execute", capture)
+    results = {}
+    try:
+        for name, (kind, fn) in scenarios.items():
+            catalog_cache.invalidate_products()
+            captured.clear()
+            try:
+                if kind == "async":
+                    async with AsyncSession() as db:
+                        users = {role: await db.get(User, user_id) for role, user_id in user_ids.items()}
+                        captured.clear()
+                        await fn(db, users)
+                else:
+                    with SyncSession() as db:
+                        users = {role: db.get(User, user_id) for role, user_id in user_ids.items()}
+                        captured.clear()
+                        fn(db, users)
+            except HTTPException:
+                pass
+            results[name] = list(captured)
+    finally:
+        event.remove(Session, "do_orm_execute", capture)
+
+    return results
+
+
+def explain_statements(engine, results: dict) -> list:
+    failures = []
+    with engine.connect() as conn:
+        for name, statements in results.items():
+            for statement, parameters in statements:
+                if not statement.is_select:
+                    continue
+                plan = conn.execute(Explain(statement), parameters).fetchall()
+                scans = find_sequential_scans(engine.dialect.name, plan)
+                status = "SEQ SCAN" if scans else "ok"
+                print(f"{name:<24} {status:<8} {'; '.join(scans)}")
+                if scans:
+                    failures.append((name, scans))
+
+    return failures
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Database URL to seed (default: a temporary SQLite file)")
+    parser.add_argument("--scale", type=int, default=20000, help="Number of products/orders to seed")
+    args = parser.parse_args(argv)
+
+    tmpdir = None
+    url = args.url
+    if not url:
+        tmpdir = tempfile.TemporaryDirectory()
+        url = f"sqlite:///{os.path.join(tmpdir.name, 'explain.db')}"
+
+    engine = build_engine(url)
+    async_engine = build_async_engine(url)
+    try:
+        Base.metadata.create_all(bind=engine)
+        create_missing_indexes(engine)
+        seed(engine, args.scale)
+
+        user_ids = {"customer": 1, "seller": 10, "admin": 2}
+        scenarios = build_scenarios(product_id=1, order_id=1)
+        results = asyncio.run(run_scenarios(engine, async_engine, scenarios, user_ids))
+        failures = explain_statements(engine, results)
+    finally:
+        asyncio.run(async_engine.dispose())
+        engine.dispose()
+        if tmpdir:
+            tmpdir.cleanup()
+
+    if failures:
+        print(f"\n{len(failures)} hot queries plan a sequential scan")
+        return 1
+
+    print("\nNo sequential scans in hot queries")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+import hashlib
+import hmac
+import random
+import time
+from contextvars import ContextVar
+from http.cookies import SimpleCookie
+from sqlalchemy import Insert, Update, Delete
+from sqlalchemy.orm import Session
+
+
+class RoutingSession(Session):
+    """Session that sends reads to a replica and everything else to the primary.
+
+    Once the session flushes it stays on the primary, so a request never
+    reads back its own writes from a lagging replica.
+    """
+
+    def __init__(self, primary=None, replicas=(), use_primary: bool = False, **kwargs):
+        super().__init__(**kwargs)
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.use_primary = use_primary
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or isinstance(clause, (Insert, Update, Delete)):
+            self.use_primary = True
+
+        if self.use_primary or not self.replicas:
+            return self.primary
+
+        return random.choice(self.replicas)
+
+
+class PrimaryPins:
+    """Sends the reads of a client that just wrote to the primary, on any worker.
+
+    The pin travels with the client as a signed cookie holding the time it
+    runs out, so no worker needs to have seen the write. `middleware`
+    reads it into the request's context and sets it when a write commits.
+    """
+
+    cookie_name = "primary_pin"
+
+    def __init__(self, secret: str, window_seconds: float = 5.0):
+        self.secret = secret.encode()
+        self.window_seconds = window_seconds
+        self._request = ContextVar("primary_pin_request", default=None)
+
+    def _sign(self, until: str) -> str:
+        return hmac.new(self.secret, until.encode(), hashlib.sha256).hexdigest()
+
+    def _is_valid(self, value: str) -> bool:
+        until, _, signature = value.partition(".")
+        if not until.isdigit() or not hmac.compare_digest(signature, self._sign(until)):
+            return False
+        return int(until) > time.time()
+
+    def pin(self):
+        """Pin the client of the current request, if any; called when a write commits."""
+        state = self._request.get()
+        if state is not None and self.window_seconds > 0:
+            state["pin_until"] = str(int(time.time() + self.window_seconds) + 1)
+
+    def is_pinned(self) -> bool:
+        state = self._request.get()
+        return state is not None and state["pinned"]
+
+    def middleware(self, app):
+        async def primary_pin_app(scope, receive, send):
+            if scope["type"] != "http":
+                await app(scope, receive, send)
+                return
+
+            cookie = SimpleCookie()
+            for name, value in scope["headers"]:
+                if name == b"cookie":
+                    try:
+                        cookie.load(value.decode("latin-1"))
+                    except Exception:
+                        pass
+            morsel = cookie.get(self.cookie_name)
+            # A dict, so sync dependencies in the threadpool (which run in
+            # a copy of this context) can still record their commits here
+            state = {"pinned": morsel is not None and self._is_valid(morsel.value), "pin_until": None}
+            token = self._request.set(state)
+
+            async def pinning_send(message):
+                if message["type"] == "http.response.start" and state["pin_until"]:
+                    until = state["pin_until"]
+                    header = (
+                        f"{self.cookie_name}={until}.{self._sign(until)}; Max-Age={int(self.window_seconds) + 1}; "
+                        "Path=/; HttpOnly; SameSite=Lax"
+                    )
+                    message = {**message, "headers": [*message.get("headers", []), (b"set-cookie", header.encode("latin-1"))]}
+                await send(message)
+
+            try:
+                await app(scope, receive, pinning_send)
+            finally:
+                self._request.reset(token)
+
+        return primary_pin_app
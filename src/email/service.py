@@ -1,10 +1,8 @@
-from dotenv import dotenv_values
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import uuid
-
-config = dotenv_values(".env")
+from src.settings import get_settings
 
 def create_verification_token() -> str:
     return str(uuid.uuid4())
@@ -13,7 +11,9 @@ def send_verification_email(email: str, token: str) -> dict:
     
     verification_link = f"http://localhost:8000/api/auth/verify-email?token={token}"
     
-    if not config["EMAIL_ENABLED"]:
+    settings = get_settings()
+
+    if not settings.email_enabled:
         return {
             "success": False,
             "message": "Email sending is disabled. Use the verification link directly.",
@@ -23,7 +23,7 @@ def send_verification_email(email: str, token: str) -> dict:
     
     try:
         msg = MIMEMultipart('alternative')
-        msg['From'] = config["EMAIL"]
+        msg['From'] = settings.email
         msg['To'] = email
         msg['Subject'] = "Verify Your Email - E-Commerce Platform"
         
@@ -77,11 +77,11 @@ def send_verification_email(email: str, token: str) -> dict:
         msg.attach(MIMEText(text_body, 'plain'))
         msg.attach(MIMEText(html_body, 'html'))
         
-        server = smtplib.SMTP(config["MAIL_SERVER"], int(config["MAIL_PORT"]), timeout=int(config["EMAIL_TIMEOUT"]))
+        server = smtplib.SMTP(settings.mail_server, settings.mail_port, timeout=settings.email_timeout)
         server.ehlo()
         server.starttls()
         server.ehlo()
-        server.login(config["EMAIL"], config["PASSWORD"])
+        server.login(settings.email, settings.password)
         server.send_message(msg)
         server.quit()
         
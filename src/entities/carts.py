@@ -1,5 +1,5 @@
 from src.database.core import Base
-from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -14,4 +14,8 @@ class CartItem(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     
     user = relationship("User", back_populates="cart_items")
-    product = relationship("Product", back_populates="cart_items")
\ No newline at end of file
+    product = relationship("Product", back_populates="cart_items")
+
+    __table_args__ = (
+        Index("ix_cart_items_user_id_product_id", "user_id", "product_id"),
+    )
\ No newline at end of file
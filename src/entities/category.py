@@ -10,5 +10,6 @@ class Category(Base):
     name = Column(String, unique=True, nullable=False)
     description = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     products = relationship("Product", back_populates="category")
\ No newline at end of file
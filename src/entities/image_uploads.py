@@ -0,0 +1,12 @@
+from src.database.core import Base
+from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from datetime import datetime
+
+
+class ImageUpload(Base):
+    """A product image uploaded on its own; holds one reference on the image until deleted."""
+    __tablename__ = "image_uploads"
+    id = Column(Integer, primary_key=True, index=True)
+    image_id = Column(Integer, ForeignKey("images.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,9 +1,35 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, DateTime, Enum, Index
 from src.database.core import Base
+from datetime import datetime
+import enum
+
+
+class ImageStatus(str, enum.Enum):
+    PENDING = "pending"
+    READY = "ready"
+    FAILED = "failed"
+
 
 class Image(Base):
     __tablename__ = "images"
 
     id = Column(Integer, primary_key=True, index=True)
-    url = Column(String, nullable=False)
-    public_id = Column(String, nullable=False)
+    # The local /static URL until the upload queue stores it remotely
+    url = Column(String)
+    public_id = Column(String)
+    # Not a native enum so the column can be added to an existing table
+    status = Column(Enum(ImageStatus, native_enum=False), nullable=False, default=ImageStatus.PENDING, server_default=ImageStatus.READY.name)
+    # Content-addressed copy on local disk, shared by every upload of the
+    # same bytes; ref_count counts the products, profile pictures and
+    # standalone uploads (image_uploads) using it
+    sha256 = Column(String(64))
+    size = Column(Integer)
+    path = Column(String)
+    ref_count = Column(Integer, nullable=False, default=0, server_default="0")
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_images_sha256", "sha256", unique=True),
+        Index("ix_images_orphans", "ref_count", sqlite_where=ref_count <= 0, postgresql_where=ref_count <= 0),
+    )
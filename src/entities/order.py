@@ -1,5 +1,5 @@
 from src.database.core import Base
-from sqlalchemy import Column, Integer,DateTime, ForeignKey, Float, Enum
+from sqlalchemy import Column, Integer,DateTime, ForeignKey, Float, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -20,7 +20,7 @@ class Order(Base):
     total_amount = Column(Float, nullable=False)
     status = Column(Enum(OrderStatus), default=OrderStatus.PENDING)
     shipping_address_id = Column(Integer, ForeignKey("addresses.id"))
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     customer = relationship("User", back_populates="orders")
@@ -28,13 +28,18 @@ class Order(Base):
     order_items = relationship("OrderItem", back_populates="order")
     payment = relationship("Payment", back_populates="order", uselist=False)
 
+    __table_args__ = (
+        Index("ix_orders_customer_id_created_at", "customer_id", "created_at"),
+        Index("ix_orders_status_created_at", "status", "created_at"),
+    )
+
 
 
 class OrderItem(Base):
     __tablename__ = "order_items"
     id = Column(Integer, primary_key=True, index=True)
-    order_id = Column(Integer, ForeignKey("orders.id"))
-    product_id = Column(Integer, ForeignKey("products.id"))
+    order_id = Column(Integer, ForeignKey("orders.id"), index=True)
+    product_id = Column(Integer, ForeignKey("products.id"), index=True)
     quantity = Column(Integer, nullable=False)
     price = Column(Float, nullable=False)
     
@@ -1,9 +1,24 @@
 from src.database.core import Base
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean, Float
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean, Float, Index, JSON, func, literal_column
 from sqlalchemy.orm  import relationship
 from datetime import datetime
 
 
+SEARCH_CONFIG = literal_column("'english'::regconfig")
+
+
+def search_document(name, description):
+    # Must stay identical to the ix_products_search expression, otherwise
+    # Postgres will not use the index.
+    return func.setweight(func.to_tsvector(SEARCH_CONFIG, func.coalesce(name, literal_column("''"))), literal_column("'A'")).op("||")(
+        func.setweight(func.to_tsvector(SEARCH_CONFIG, func.coalesce(description, literal_column("''"))), literal_column("'B'"))
+    )
+
+
+def active_only(is_active):
+    return {"sqlite_where": is_active == True, "postgresql_where": is_active == True}
+
+
 class Product(Base):
     __tablename__ = "products"
     id = Column(Integer, primary_key=True, index=True)
@@ -12,15 +27,47 @@ class Product(Base):
     price = Column(Float, nullable=False)
     stock = Column(Integer, default=0)
     image_url = Column(String)
-    category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
-    seller_id = Column(Integer, ForeignKey("users.id"))
-    is_active = Column(Boolean, default=True)
+    image_id = Column(Integer, ForeignKey("images.id"), index=True)
+    # Resized copies of image_url by variant name, filled in by the image pipeline
+    image_variants = Column(JSON)
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=False, index=True)
+    seller_id = Column(Integer, ForeignKey("users.id"), index=True)
+    is_active = Column(Boolean, default=True, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    sales_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # Review aggregates, kept up to date by create_review
+    rating_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_sum = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_1 = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_2 = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_3 = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_4 = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_5 = Column(Integer, nullable=False, default=0, server_default="0")
     
     category = relationship("Category", back_populates="products")
     seller = relationship("User", back_populates="products")
     cart_items = relationship("CartItem", back_populates="product")
     order_items = relationship("OrderItem", back_populates="product")
     reviews = relationship("Review", back_populates="product")
+
+    @property
+    def rating_average(self):
+        return round(self.rating_sum / self.rating_count, 2) if self.rating_count else None
+
+    @property
+    def rating_histogram(self):
+        return [self.rating_1, self.rating_2, self.rating_3, self.rating_4, self.rating_5]
+
+    __table_args__ = (
+        Index("ix_products_search", search_document(name, description), postgresql_using="gin").ddl_if(dialect="postgresql"),
+        # One partial index per listing sort, with and without a category
+        Index("ix_products_active_created_at", "created_at", "id", **active_only(is_active)),
+        Index("ix_products_active_price", "price", "id", **active_only(is_active)),
+        Index("ix_products_active_sales_count", "sales_count", "id", **active_only(is_active)),
+        Index("ix_products_active_category_created_at", "category_id", "created_at", "id", **active_only(is_active)),
+        Index("ix_products_active_category_price", "category_id", "price", "id", **active_only(is_active)),
+        Index("ix_products_active_category_sales_count", "category_id", "sales_count", "id", **active_only(is_active)),
+    )
     
 
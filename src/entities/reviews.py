@@ -1,5 +1,5 @@
 from src.database.core import Base
-from sqlalchemy import Column, Integer, Text, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, Text, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -14,4 +14,11 @@ class Review(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     
     product = relationship("Product", back_populates="reviews")
-    user = relationship("User", back_populates="reviews")
\ No newline at end of file
+    user = relationship("User", back_populates="reviews")
+
+    __table_args__ = (
+        Index("ix_reviews_product_id_user_id", "product_id", "user_id"),
+        # Keyset pagination of a product's reviews for each sort order
+        Index("ix_reviews_product_created_at", "product_id", "created_at", "id"),
+        Index("ix_reviews_product_rating", "product_id", "rating", "id"),
+    )
\ No newline at end of file
@@ -0,0 +1,34 @@
+from src.database.core import Base
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Index
+from sqlalchemy.orm import relationship
+from datetime import datetime
+import enum
+
+
+class UploadJobStatus(str, enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class UploadJob(Base):
+    __tablename__ = "upload_jobs"
+    id = Column(Integer, primary_key=True, index=True)
+    image_id = Column(Integer, ForeignKey("images.id"), nullable=False, index=True)
+    local_path = Column(String, nullable=False)
+    folder = Column(String, nullable=False)
+    status = Column(Enum(UploadJobStatus), nullable=False, default=UploadJobStatus.PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    # A running job whose lease has expired is picked up again
+    locked_until = Column(DateTime)
+    last_error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    image = relationship("Image")
+
+    __table_args__ = (
+        Index("ix_upload_jobs_status_next_attempt_at", "status", "next_attempt_at"),
+    )
@@ -1,5 +1,5 @@
 from src.database.core import Base
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum, ForeignKey
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -20,6 +20,8 @@ class User(Base):
     full_name = Column(String)
     phone = Column(String)
     profile_picture = Column(String)
+    # Holds a reference on the image until the picture is replaced
+    profile_image_id = Column(Integer, ForeignKey("images.id"))
     role = Column(Enum(UserRole), default=UserRole.CUSTOMER)
     is_active = Column(Boolean, default=True)
     is_verified = Column(Boolean, default=False)
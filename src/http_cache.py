@@ -0,0 +1,51 @@
+import hashlib
+from typing import Iterable, Optional
+from fastapi import Request, Response, status
+
+
+# Cache-Control per kind of resource. Everything here sits behind auth, so
+# responses are private; clients revalidate with If-None-Match.
+LIST_CACHE_CONTROL = "private, no-cache"
+PRODUCT_CACHE_CONTROL = "private, max-age=30, must-revalidate"
+CATEGORY_CACHE_CONTROL = "private, max-age=300, must-revalidate"
+REVIEW_CACHE_CONTROL = "private, max-age=60, must-revalidate"
+# Content-addressed files never change under the same URL
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def entity_version(entity):
+    return getattr(entity, "updated_at", None) or getattr(entity, "created_at", None)
+
+
+def make_etag(*parts) -> str:
+    return '"' + hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def etag_for(entities: Iterable, *extra) -> str:
+    """Strong ETag for a list of entities from each one's id and version."""
+    return make_etag([(entity.id, entity_version(entity)) for entity in entities], *extra)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    # If-None-Match uses the weak comparison, so W/"x" matches "x"
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def not_modified(request: Request, response: Response, etag: str, cache_control: str) -> Optional[Response]:
+    """Set ETag and Cache-Control; return a 304 if the client's copy is current.
+
+    The 304 repeats the headers already set on `response` so clients keep
+    e.g. the next-page cursor.
+    """
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+
+    if not etag_matches(request.headers.get("if-none-match"), etag):
+        return None
+
+    headers = {key: value for key, value in response.headers.items() if key.lower() != "content-length"}
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
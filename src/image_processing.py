@@ -0,0 +1,184 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from PIL import Image, ImageOps
+from src.settings import get_settings
+
+
+# name -> bounding box. Images are scaled down to fit, never up.
+VARIANTS = {
+    "thumb": (160, 160),
+    "card": (480, 480),
+    "detail": (1200, 1200),
+}
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+MAX_IMAGE_PIXELS = 40_000_000
+
+
+def variant_paths(output_dir: str, stem: str, name: str) -> tuple:
+    output = Path(output_dir)
+    return output / f"{stem}-{name}.webp", output / f"{stem}-{name}.jpg"
+
+
+def existing_variants(output_dir: str, stem: str) -> dict:
+    """Variants already rendered for `stem`, or None if any file is missing.
+
+    Stems are content digests, so another product with the same image may
+    have rendered them already. Only image headers are read.
+    """
+    variants = {}
+    for name in VARIANTS:
+        webp_path, jpeg_path = variant_paths(output_dir, stem, name)
+        if not (webp_path.exists() and jpeg_path.exists()):
+            return None
+        with Image.open(jpeg_path) as image:
+            variants[name] = {"width": image.width, "height": image.height, "webp": str(webp_path), "jpeg": str(jpeg_path)}
+
+    return variants
+
+
+def open_image(source_path: str) -> tuple:
+    """Decode the first frame with EXIF orientation applied. Returns (image, has_alpha)."""
+    Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+    with Image.open(source_path) as original:
+        original.seek(0)
+        image = ImageOps.exif_transpose(original)
+        has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+        return image.convert("RGBA" if has_alpha else "RGB"), has_alpha
+
+
+def flatten(image: Image.Image) -> Image.Image:
+    # JPEG has no alpha channel; flatten onto white
+    flat = Image.new("RGB", image.size, (255, 255, 255))
+    flat.paste(image, mask=image.getchannel("A"))
+    return flat
+
+
+def render_variants(source_path: str, output_dir: str, stem: str) -> dict:
+    """Decode an image once and write every variant as WebP and JPEG.
+
+    Runs in a worker process. Metadata (EXIF, ICC, comments) is not copied
+    to the outputs; EXIF orientation is applied to the pixels first so
+    stripping it does not rotate the picture.
+    """
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    image, has_alpha = open_image(source_path)
+
+    variants = {}
+    for name, box in VARIANTS.items():
+        resized = image.copy()
+        resized.thumbnail(box, Image.Resampling.LANCZOS)
+
+        webp_path, jpeg_path = variant_paths(output_dir, stem, name)
+        resized.save(webp_path, "WEBP", quality=WEBP_QUALITY, method=4)
+        if has_alpha:
+            resized = flatten(resized)
+        resized.save(jpeg_path, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+
+        variants[name] = {
+            "width": resized.width,
+            "height": resized.height,
+            "webp": str(webp_path),
+            "jpeg": str(jpeg_path)
+        }
+
+    return variants
+
+
+def resize_image(source_path: str, output_path: str, width: int, format: str, quality: int):
+    """Write `source_path` scaled down to `width` pixels wide as `format` (a Pillow format name).
+
+    Runs in a worker process; metadata is stripped as in render_variants.
+    Images narrower than `width` keep their size.
+    """
+    image, has_alpha = open_image(source_path)
+    if image.width > width:
+        image = image.resize((width, max(round(image.height * width / image.width), 1)), Image.Resampling.LANCZOS)
+
+    if format == "WEBP":
+        image.save(output_path, "WEBP", quality=quality, method=4)
+    else:
+        if has_alpha:
+            image = flatten(image)
+        image.save(output_path, "JPEG", quality=quality, optimize=True, progressive=True)
+
+
+def remove_variants(output_dir: str, stem: str):
+    for name in VARIANTS:
+        for path in variant_paths(output_dir, stem, name):
+            if path.exists():
+                path.unlink()
+
+
+class ImagePipeline:
+    """Renders image variants and resized copies on a process pool.
+
+    Decoding and resampling hold the GIL, so they run in separate
+    processes. The pool is started on first use with the spawn method, so
+    workers never inherit the parent's threads or database connections.
+    """
+
+    def __init__(self, max_workers: int = None):
+        self.max_workers = max_workers or min(os.cpu_count() or 1, 4)
+        self._executor = None
+        self._lock = threading.Lock()
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _run(self, function, *args):
+        executor = self._get_executor()
+        with self._lock:
+            self.running += 1
+        try:
+            result = executor.submit(function, *args).result()
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self.running -= 1
+
+        with self._lock:
+            self.completed += 1
+        return result
+
+    def render(self, source_path: str, output_dir: str, stem: str) -> dict:
+        """Render the variants of one image, blocking until they are written."""
+        return self._run(render_variants, source_path, output_dir, stem)
+
+    def resize(self, source_path: str, output_path: str, width: int, format: str, quality: int):
+        """Write one resized copy of an image, blocking until it is written."""
+        self._run(resize_image, source_path, output_path, width, format, quality)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "started": self._executor is not None,
+                "running": self.running,
+                "completed": self.completed,
+                "failed": self.failed
+            }
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+image_pipeline = ImagePipeline(max_workers=get_settings().image_workers)
@@ -0,0 +1,130 @@
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, Optional
+from src.settings import get_settings
+
+
+class ResizeCache:
+    """Size-bounded LRU of resized images on disk.
+
+    The index (file name -> size, least recently used first) is kept in
+    memory and rebuilt from the directory on first use, oldest file first.
+    Concurrent requests for a missing entry wait for the first request's
+    render instead of rendering it again.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _load(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".tmp"):
+                os.remove(entry.path)
+            elif entry.is_file():
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name, stat.st_size))
+
+        for _, name, size in sorted(files):
+            self._entries[name] = size
+            self._bytes += size
+        self._loaded = True
+        self._evict()
+
+    def _evict(self):
+        # Keeps the newest entry even when it alone is over the limit
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            name, size = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+            (self.directory / name).unlink(missing_ok=True)
+
+    def get(self, name: str) -> Optional[bytes]:
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            if name not in self._entries:
+                return None
+            self._entries.move_to_end(name)
+            self.hits += 1
+
+        try:
+            return (self.directory / name).read_bytes()
+        except FileNotFoundError:
+            with self._lock:
+                self._bytes -= self._entries.pop(name, 0)
+            return None
+
+    def get_or_create(self, name: str, render: Callable[[str], None]) -> bytes:
+        """Return the cached file `name`, calling render(path) to write it first if missing."""
+        data = self.get(name)
+        if data is not None:
+            return data
+
+        with self._lock:
+            future = self._pending.get(name)
+            owner = future is None
+            if owner:
+                future = self._pending[name] = Future()
+                self.misses += 1
+        if not owner:
+            return future.result()
+
+        descriptor, temp_path = tempfile.mkstemp(dir=self.directory, prefix=f".{name}.", suffix=".tmp")
+        os.close(descriptor)
+        try:
+            render(temp_path)
+            data = Path(temp_path).read_bytes()
+            os.replace(temp_path, self.directory / name)
+            with self._lock:
+                self._bytes += len(data) - self._entries.pop(name, 0)
+                self._entries[name] = len(data)
+                self._evict()
+            future.set_result(data)
+            return data
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            with self._lock:
+                self._pending.pop(name, None)
+
+    def discard(self, prefix: str):
+        """Drop every entry whose name starts with `prefix`, e.g. an image digest."""
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            for name in [name for name in self._entries if name.startswith(prefix)]:
+                self._bytes -= self._entries.pop(name)
+                (self.directory / name).unlink(missing_ok=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+
+settings = get_settings()
+resize_cache = ResizeCache(settings.resize_cache_dir, settings.resize_cache_max_bytes)
@@ -0,0 +1,40 @@
+from fastapi import APIRouter, BackgroundTasks, Depends, Path, Request, status
+from sqlalchemy.orm import Session
+from src.auth.service import get_current_user
+from src.database.core import get_db
+from src.entities.users import User
+from src.images.models import ImageFormat, ImageResponse
+from src.images.service import delete_image_upload, get_image, get_resized_image
+
+router = APIRouter(
+    tags=["Images"],
+    prefix="/api/images"
+)
+
+
+@router.get("/{image_id}", response_model=ImageResponse)
+def get_images(image_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    """Poll an uploaded image; `url` is set once `status` is `ready`."""
+    return get_image(image_id, current_user, db)
+
+
+@router.delete("/uploads/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_upload(upload_id: int, background_tasks: BackgroundTasks, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    """Delete a product image upload (`upload_id` from the upload response)."""
+    return delete_image_upload(upload_id, background_tasks, current_user, db)
+
+
+@router.get("/{digest}/resize")
+def resize_image(
+    request: Request,
+    digest: str = Path(..., pattern="^[0-9a-f]{64}$", description="SHA-256 of the stored image, the name of its file"),
+    width: int = 480,
+    format: ImageFormat = ImageFormat.WEBP,
+    quality: int = 80,
+    db: Session = Depends(get_db)
+):
+    """A stored image scaled down to `width`, cached and served with immutable caching headers.
+
+    Public like /static, so it can be used directly in `<img>` tags.
+    """
+    return get_resized_image(digest, request, width, format, quality, db)
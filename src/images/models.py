@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+from enum import Enum
+from src.entities.images import ImageStatus
+
+
+class ImageFormat(str, Enum):
+    WEBP = "webp"
+    JPEG = "jpeg"
+
+
+class ImageResponse(BaseModel):
+    id: int
+    status: ImageStatus
+    url: Optional[str] = None
+    public_id: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,219 @@
+import asyncio
+import random
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import and_, func, or_, select, update
+from src.database.core import AsyncSessionLocal
+from src.entities.images import Image, ImageStatus
+from src.entities.upload_jobs import UploadJob, UploadJobStatus
+from src.images.storage import StorageBackend, get_storage
+from src.settings import get_settings
+
+
+class UploadQueue:
+    """Moves saved uploads to storage from a durable `upload_jobs` table.
+
+    Each worker process runs `concurrency` tasks. A task claims one due job
+    with a conditional UPDATE, so jobs are never run twice even with many
+    processes polling the same table. Failures are retried with
+    exponential backoff and jitter until `max_attempts`; a job left running
+    by a dead process is picked up again when its lease expires.
+    """
+
+    def __init__(
+        self,
+        storage: StorageBackend,
+        concurrency: int = 4,
+        max_attempts: int = 5,
+        retry_base_seconds: float = 2.0,
+        retry_max_seconds: float = 300.0,
+        lease_seconds: float = 300.0,
+        poll_seconds: float = 5.0
+    ):
+        self.storage = storage
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self._tasks = []
+        self._wakeup: Optional[asyncio.Event] = None
+        # Bookkeeping is a few short statements per job, so it is
+        # serialised; with in-memory SQLite every async session shares one
+        # connection and interleaved transactions would undo each other.
+        self._db_lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.in_flight = 0
+        self.completed = 0
+        self.retried = 0
+        self.failed = 0
+
+    def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._db_lock = asyncio.Lock()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self):
+        """Wake idle workers; safe to call from any thread."""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def backoff(self, attempts: int) -> float:
+        delay = min(self.retry_base_seconds * 2 ** (attempts - 1), self.retry_max_seconds)
+        return delay * random.uniform(0.5, 1.0)
+
+    async def _worker(self):
+        while True:
+            try:
+                async with self._db_lock:
+                    job = await self._claim()
+                    idle_seconds = self.poll_seconds if job else await self._seconds_until_due()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                print(f"Upload queue: could not claim a job: {exc}")
+                job, idle_seconds = None, self.poll_seconds
+
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=idle_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                await self._run(*job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                # The lease expires and another worker retries the job
+                print(f"Upload queue: job {job[0]} could not be recorded: {exc}")
+
+    async def _claim(self):
+        now = datetime.utcnow()
+        due = or_(
+            and_(UploadJob.status == UploadJobStatus.PENDING, UploadJob.next_attempt_at <= now),
+            and_(UploadJob.status == UploadJobStatus.RUNNING, UploadJob.locked_until < now)
+        )
+
+        async with AsyncSessionLocal() as db:
+            while True:
+                candidate = (await db.execute(
+                    select(UploadJob.id, UploadJob.attempts, UploadJob.image_id, UploadJob.local_path, UploadJob.folder)
+                    .where(due).order_by(UploadJob.next_attempt_at).limit(1)
+                )).first()
+                if candidate is None:
+                    return None
+
+                # Only one claimant can move the job past the attempt count it saw
+                result = await db.execute(
+                    update(UploadJob)
+                    .where(UploadJob.id == candidate.id, UploadJob.attempts == candidate.attempts, due)
+                    .values(
+                        status=UploadJobStatus.RUNNING,
+                        attempts=candidate.attempts + 1,
+                        locked_until=now + timedelta(seconds=self.lease_seconds)
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                await db.commit()
+                if result.rowcount:
+                    return candidate.id, candidate.attempts + 1, candidate.image_id, candidate.local_path, candidate.folder
+
+    async def _seconds_until_due(self) -> float:
+        async with AsyncSessionLocal() as db:
+            next_attempt_at = await db.scalar(
+                select(func.min(UploadJob.next_attempt_at)).where(UploadJob.status == UploadJobStatus.PENDING)
+            )
+        if next_attempt_at is None:
+            return self.poll_seconds
+        return min(max((next_attempt_at - datetime.utcnow()).total_seconds(), 0.01), self.poll_seconds)
+
+    async def _run(self, job_id: int, attempts: int, image_id: int, local_path: str, folder: str):
+        self.in_flight += 1
+        error = None
+        try:
+            stored = await asyncio.to_thread(self.storage.upload, local_path, folder)
+        except Exception as exc:
+            error = exc
+        finally:
+            # Also on cancellation at shutdown; the lease makes the job run again
+            self.in_flight -= 1
+
+        if error is not None:
+            async with self._db_lock:
+                await self._fail(job_id, attempts, image_id, error)
+            return
+
+        async with self._db_lock, AsyncSessionLocal() as db:
+            await db.execute(
+                update(Image).where(Image.id == image_id)
+                .values(url=stored["url"], public_id=stored["public_id"], status=ImageStatus.READY)
+                .execution_options(synchronize_session=False)
+            )
+            await db.execute(
+                update(UploadJob).where(UploadJob.id == job_id)
+                .values(status=UploadJobStatus.DONE, locked_until=None, last_error=None)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        self.completed += 1
+
+    async def _fail(self, job_id: int, attempts: int, image_id: int, exc: Exception):
+        error = f"{type(exc).__name__}: {exc}"
+        async with AsyncSessionLocal() as db:
+            if attempts < self.max_attempts:
+                self.retried += 1
+                await db.execute(
+                    update(UploadJob).where(UploadJob.id == job_id)
+                    .values(
+                        status=UploadJobStatus.PENDING,
+                        next_attempt_at=datetime.utcnow() + timedelta(seconds=self.backoff(attempts)),
+                        locked_until=None,
+                        last_error=error
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+            else:
+                self.failed += 1
+                print(f"Upload job {job_id} failed after {attempts} attempts: {error}")
+                await db.execute(
+                    update(UploadJob).where(UploadJob.id == job_id)
+                    .values(status=UploadJobStatus.FAILED, locked_until=None, last_error=error)
+                    .execution_options(synchronize_session=False)
+                )
+                await db.execute(
+                    update(Image).where(Image.id == image_id).values(status=ImageStatus.FAILED)
+                    .execution_options(synchronize_session=False)
+                )
+            await db.commit()
+
+    def stats(self) -> dict:
+        return {
+            "storage": type(self.storage).__name__,
+            "workers": len(self._tasks),
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "retried": self.retried,
+            "failed": self.failed
+        }
+
+
+settings = get_settings()
+upload_queue = UploadQueue(
+    storage=get_storage(),
+    concurrency=settings.upload_workers,
+    max_attempts=settings.upload_max_attempts,
+    retry_base_seconds=settings.upload_retry_base_seconds,
+    lease_seconds=settings.upload_lease_seconds,
+    poll_seconds=settings.upload_poll_seconds
+)
@@ -0,0 +1,247 @@
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from fastapi import BackgroundTasks, Depends, HTTPException, Request, Response, UploadFile, status
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from src.auth.service import get_current_user
+from src.database.core import get_db, SessionLocal
+from src.entities.image_uploads import ImageUpload
+from src.entities.images import Image, ImageStatus
+from src.entities.upload_jobs import UploadJob, UploadJobStatus
+from src.entities.users import User, UserRole
+from src.http_cache import IMMUTABLE_CACHE_CONTROL, etag_matches
+from src.image_processing import image_pipeline, remove_variants
+from src.images.cache import resize_cache
+from src.images.models import ImageFormat
+from src.images.queue import upload_queue
+from src.settings import get_settings
+from src.upload_settings import ingest_image_upload, PRODUCT_VARIANTS_DIR
+
+
+REFERENCE_ATTEMPTS = 3
+ORPHAN_BATCH_SIZE = 1000
+
+settings = get_settings()
+
+# Allowed resize parameters; a short list keeps the cache small and hot
+RESIZE_WIDTHS = (160, 320, 480, 640, 960, 1200, 1600)
+RESIZE_QUALITIES = (50, 65, 80, 90)
+# format -> (Pillow format, file extension, media type)
+RESIZE_FORMATS = {
+    ImageFormat.WEBP: ("WEBP", "webp", "image/webp"),
+    ImageFormat.JPEG: ("JPEG", "jpg", "image/jpeg"),
+}
+
+
+def _reference(digest: str, size: int, path: Path, db: Session) -> tuple:
+    # Returns (image, created). The update is conditional on the row still
+    # existing and restarts its grace period, so a concurrent collect_orphans
+    # either leaves it alone or has already deleted it and we create it again.
+    for _ in range(REFERENCE_ATTEMPTS):
+        image = db.query(Image).filter(Image.sha256 == digest).first()
+        if image is not None:
+            result = db.execute(
+                update(Image).where(Image.id == image.id).values(ref_count=Image.ref_count + 1, updated_at=datetime.utcnow()),
+                execution_options={"synchronize_session": False}
+            )
+            db.commit()
+            if result.rowcount:
+                db.refresh(image)
+                return image, False
+            continue
+
+        image = Image(
+            sha256=digest,
+            size=size,
+            path=str(path),
+            url=f"/{path.as_posix()}",
+            status=ImageStatus.READY,
+            ref_count=1
+        )
+        db.add(image)
+        try:
+            db.commit()
+        except IntegrityError:
+            # Another upload of the same bytes created it first
+            db.rollback()
+            continue
+        db.refresh(image)
+        return image, True
+
+    raise HTTPException(status_code=503, detail="Could not store the image, please retry")
+
+
+def store_image(file: UploadFile, directory: Path, db: Session) -> Image:
+    """Validate and save an uploaded image under its SHA-256 digest, taking a reference on it.
+
+    Identical bytes are written to disk once; later uploads only bump the
+    reference count of the existing Image. Release the reference with
+    `release_image` when the product, profile or upload using it goes away.
+    """
+    temp_path, digest, size, extension = ingest_image_upload(file, directory)
+    try:
+        image, created = _reference(digest, size, directory / f"{digest}{extension}", db)
+        # A new row always writes its file, in case collect_orphans is
+        # removing the previous copy of the same bytes right now
+        if created or not os.path.exists(image.path):
+            os.replace(temp_path, image.path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    return image
+
+
+def release_image(image_id: int, db: Session):
+    """Drop one reference; the caller commits. Run collect_orphans afterwards."""
+    db.execute(
+        update(Image).where(Image.id == image_id).values(ref_count=Image.ref_count - 1),
+        execution_options={"synchronize_session": False}
+    )
+
+
+def release_user_images(user_id: int, db: Session):
+    """Drop the references held by the profile picture and uploads of a user being deleted; the caller commits."""
+    profile_image_id = db.scalar(select(User.profile_image_id).where(User.id == user_id))
+    if profile_image_id:
+        release_image(profile_image_id, db)
+    for image_id in db.scalars(select(ImageUpload.image_id).where(ImageUpload.user_id == user_id)).all():
+        release_image(image_id, db)
+    db.execute(delete(ImageUpload).where(ImageUpload.user_id == user_id))
+
+
+def collect_orphans() -> int:
+    """Delete stored images nobody has referenced for the grace period, with their local files.
+
+    Runs on its own session so it can be a background task. Images from
+    before content addressing (no digest) are never touched. Remote copies
+    are kept: their URLs were handed out and may still be in use.
+    """
+    db = SessionLocal()
+    removed = 0
+    cutoff = datetime.utcnow() - timedelta(hours=settings.orphan_image_grace_hours)
+    unused = (Image.ref_count <= 0, func.coalesce(Image.updated_at, Image.created_at) < cutoff)
+    try:
+        orphans = db.execute(
+            select(Image.id, Image.sha256, Image.path)
+            .where(*unused, Image.sha256.isnot(None), Image.status != ImageStatus.PENDING)
+            .limit(ORPHAN_BATCH_SIZE)
+        ).all()
+
+        for orphan in orphans:
+            db.execute(delete(UploadJob).where(
+                UploadJob.image_id == orphan.id,
+                UploadJob.status.in_([UploadJobStatus.DONE, UploadJobStatus.FAILED])
+            ))
+            try:
+                result = db.execute(delete(Image).where(Image.id == orphan.id, *unused))
+                db.commit()
+            except IntegrityError:
+                # Still referenced by a product; the count has drifted
+                db.rollback()
+                print(f"Image {orphan.id} has no references counted but is still in use")
+                continue
+            if not result.rowcount:
+                continue
+            removed += 1
+
+            # Same bytes uploaded again since: that upload owns the file now
+            if db.scalar(select(Image.id).where(Image.sha256 == orphan.sha256)) is None:
+                if orphan.path and os.path.exists(orphan.path):
+                    os.remove(orphan.path)
+                remove_variants(str(PRODUCT_VARIANTS_DIR), orphan.sha256)
+                resize_cache.discard(orphan.sha256)
+    finally:
+        db.close()
+
+    return removed
+
+
+def enqueue_upload(image: Image, folder: str, db: Session) -> Image:
+    """Queue a remote copy of a stored image unless it has one or one is on its way."""
+    result = db.execute(
+        update(Image)
+        .where(Image.id == image.id, Image.public_id.is_(None), Image.status != ImageStatus.PENDING)
+        .values(status=ImageStatus.PENDING),
+        execution_options={"synchronize_session": False}
+    )
+    if result.rowcount:
+        db.add(UploadJob(image_id=image.id, local_path=image.path, folder=folder))
+    db.commit()
+    db.refresh(image)
+
+    if result.rowcount:
+        upload_queue.notify()
+    return image
+
+
+def delete_image_upload(
+    upload_id: int,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Give up a standalone upload; its image is collected after the grace period unless still used."""
+    upload = db.query(ImageUpload).filter(ImageUpload.id == upload_id).first()
+    if not upload:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    if current_user.role != UserRole.ADMIN and upload.user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    release_image(upload.image_id, db)
+    db.delete(upload)
+    db.commit()
+    background_tasks.add_task(collect_orphans)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+def get_image(image_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    image = db.query(Image).filter(Image.id == image_id).first()
+    if not image:
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    return image
+
+
+def get_resized_image(
+    digest: str,
+    request: Request,
+    width: int,
+    format: ImageFormat = ImageFormat.WEBP,
+    quality: int = 80,
+    db: Session = Depends(get_db)
+):
+    """A stored image scaled down to `width`, rendered once and then served from the resize cache.
+
+    The URL names the content by digest, so responses are immutable.
+    """
+    if width not in RESIZE_WIDTHS:
+        raise HTTPException(status_code=400, detail=f"width must be one of {', '.join(map(str, RESIZE_WIDTHS))}")
+    if quality not in RESIZE_QUALITIES:
+        raise HTTPException(status_code=400, detail=f"quality must be one of {', '.join(map(str, RESIZE_QUALITIES))}")
+
+    pillow_format, extension, media_type = RESIZE_FORMATS[format]
+    etag = f'"{digest[:32]}-{width}-{quality}-{extension}"'
+    headers = {"ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    name = f"{digest}-{width}w-q{quality}.{extension}"
+    data = resize_cache.get(name)
+    if data is None:
+        source = db.scalar(select(Image.path).where(Image.sha256 == digest))
+        if not source or not os.path.exists(source):
+            raise HTTPException(status_code=404, detail="Image not found")
+        # Absolute paths: pool workers need not share our working directory
+        try:
+            data = resize_cache.get_or_create(
+                name,
+                lambda output_path: image_pipeline.resize(os.path.abspath(source), os.path.abspath(output_path), width, pillow_format, quality)
+            )
+        except Exception as exc:
+            print(f"Resizing image {digest} failed: {exc}")
+            raise HTTPException(status_code=422, detail="Image could not be processed")
+
+    return Response(content=data, media_type=media_type, headers=headers)
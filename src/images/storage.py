@@ -0,0 +1,57 @@
+import re
+import shutil
+import uuid
+from pathlib import Path
+from typing import Protocol
+from src.cloudinary_config import cloudinary
+from src.settings import get_settings
+from src.static_files import fingerprinted_path
+import cloudinary.uploader
+
+
+class StorageBackend(Protocol):
+    def upload(self, path: str, folder: str) -> dict:
+        """Store the file at `path` and return its {"url", "public_id"}."""
+        ...
+
+    def delete(self, public_id: str):
+        ...
+
+
+class CloudinaryStorage:
+    def upload(self, path: str, folder: str) -> dict:
+        result = cloudinary.uploader.upload(path, folder=folder)
+        return {"url": result.get("secure_url"), "public_id": result.get("public_id")}
+
+    def delete(self, public_id: str):
+        cloudinary.uploader.destroy(public_id)
+
+
+class LocalStorage:
+    """Copies files under a directory served by the /static mount.
+
+    Stands in for Cloudinary in development, tests and benchmarks.
+    """
+
+    def __init__(self, root: str, base_url: str = "/"):
+        self.root = Path(root)
+        self.base_url = base_url
+
+    def upload(self, path: str, folder: str) -> dict:
+        directory = self.root / (re.sub(r"[^A-Za-z0-9_-]+", "-", folder).strip("-").lower() or "uploads")
+        directory.mkdir(parents=True, exist_ok=True)
+        target = directory / f"{uuid.uuid4()}{Path(path).suffix.lower()}"
+        shutil.copyfile(path, target)
+
+        public_id = target.relative_to(self.root).as_posix()
+        return {"url": f"{self.base_url}{fingerprinted_path(target).as_posix()}", "public_id": public_id}
+
+    def delete(self, public_id: str):
+        (self.root / public_id).unlink(missing_ok=True)
+
+
+def get_storage() -> StorageBackend:
+    settings = get_settings()
+    if settings.storage_backend == "local":
+        return LocalStorage(settings.local_storage_dir)
+    return CloudinaryStorage()
@@ -1,7 +1,17 @@
 from fastapi import FastAPI
-from src.database.core import engine, Base, SessionLocal
-from src.database import init_db
-from src.entities import users, products, carts, category, order, payments, reviews, shipping_address as table_models 
+from src.database.core import engine, async_engine, async_replica_engines, Base, SessionLocal, primary_pins
+from src.database import init_db, add_missing_columns, drop_stale_not_null, create_missing_indexes
+from src.auth.service import password_hasher
+from src.pagination import NEXT_CURSOR_HEADER
+from src.upload_limits import UploadSizeLimitMiddleware
+from src.products.search import product_search
+from src.review.service import repair_rating_aggregates
+from src.image_processing import image_pipeline
+from src.images.queue import upload_queue
+from src.images.controller import router as image_routes
+from src.products.autocomplete import autocomplete
+from src.products.service import uses_database_search
+from src.entities import users, products, carts, category, order, payments, reviews, refresh_tokens, images, image_uploads, upload_jobs, shipping_address as table_models 
 from src.users.controller import router as user_routes
 from src.auth.controller import router as login_routes
 from src.payment.controller import router as payment_routes
@@ -13,11 +23,14 @@ from src.products.controller import router as product_routes
 from src.address.controller import router as address_routes
 from src.admin_dashboard.controller import router as admin_routes
 from src.sellers import router as sellers_routes
-from fastapi.staticfiles import StaticFiles
+from src.static_files import CachedStaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 table_models.Base.metadata.create_all(bind=engine)
+added_columns = add_missing_columns(engine)
+drop_stale_not_null(engine)
+create_missing_indexes(engine)
 
 
 @asynccontextmanager
@@ -26,13 +39,26 @@ async def lifespan(app: FastAPI):
     db = SessionLocal()
     try:
         init_db(db)
+        if not uses_database_search():
+            product_search.rebuild(db)
+        autocomplete.rebuild(db)
+        if ("products", "rating_count") in added_columns:
+            print(f"Backfilling product ratings: {repair_rating_aggregates(db)}")
     finally:
         db.close()
+
+    upload_queue.start()
     
     yield
     
     
     print("Shutting down...")
+    await upload_queue.stop()
+    password_hasher.shutdown()
+    image_pipeline.shutdown()
+    await async_engine.dispose()
+    for replica in async_replica_engines:
+        await replica.dispose()
 
 app = FastAPI(
     title="E-Commerce API",
@@ -41,12 +67,17 @@ app = FastAPI(
 )
 
 
+# Product imports are large by design and check their own rows
+app.add_middleware(UploadSizeLimitMiddleware, exempt=("/api/products/import",))
+# Read-your-writes across workers: a signed cookie pins a writer's reads to the primary
+app.add_middleware(primary_pins.middleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
 
@@ -81,7 +112,8 @@ app.include_router(address_routes)
 app.include_router(order_routes)
 app.include_router(payment_routes)
 app.include_router(review_routes)
+app.include_router(image_routes)
 
 
 
-app.mount("/static", StaticFiles(directory="static"), name="static")
+app.mount("/static", CachedStaticFiles(directory="static"), name="static")
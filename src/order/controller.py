@@ -1,12 +1,14 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from src.order.models import OrderResponse, OrderCreate, OrderStatusUpdate
 from src.auth.service import get_current_user
-from src.database.core import get_db
+from src.database.core import get_db, get_async_read_db
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.entities.users import User
 from src.auth.service import require_role
 from src.users.models import UserRole
-from typing import List
+from typing import List, Optional
+from src.pagination import LimitParam, CursorParam, set_next_cursor
 from src.order.service import create_order, update_order_status, list_orders, get_order
 
 router = APIRouter(
@@ -21,8 +23,10 @@ def create_orders(order_data: OrderCreate, current_user: User = Depends(require_
     return create_order(order_data, current_user, db)
 
 @router.get("/", response_model=List[OrderResponse])
-def list_all_orders(current_user: User = Depends(require_role([UserRole.SELLER, UserRole.CUSTOMER, UserRole.ADMIN])), db: Session = Depends(get_db)):
-    return list_orders(current_user, db)
+async def list_all_orders(response: Response, current_user: User = Depends(require_role([UserRole.SELLER, UserRole.CUSTOMER, UserRole.ADMIN])), skip: int = 0, limit: int = LimitParam, cursor: Optional[str] = CursorParam, db: AsyncSession = Depends(get_async_read_db)):
+    orders, next_cursor = await list_orders(current_user, skip, limit, cursor, db)
+    set_next_cursor(response, next_cursor)
+    return orders
 
 
 @router.get("/{order_id}", response_model=OrderResponse)
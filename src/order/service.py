@@ -1,13 +1,20 @@
 from src.order.models import OrderCreate, OrderStatusUpdate
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.entities.users import User
 from fastapi import Depends, HTTPException
-from src.database.core import get_db
+from src.database.core import get_db, get_async_db
 from src.entities.order import Order, OrderItem, OrderStatus
 from src.entities.carts import CartItem
+from src.entities.products import Product
 from src.users.models import UserRole
 from datetime import datetime
 from src.auth.service import require_role
+from src.pagination import paginate, get_page
+from src.products.autocomplete import autocomplete, PRODUCT
+from src.products.cache import catalog_cache
+from typing import Optional
 
 
 def create_order(
@@ -63,21 +70,31 @@ def create_order(
 
         
         cart_item.product.stock -= cart_item.quantity
+        cart_item.product.sales_count = Product.sales_count + cart_item.quantity
 
         
         db.delete(cart_item)
 
     db.commit()
     db.refresh(order)
+    catalog_cache.invalidate_products([order_item.product_id for order_item in order.order_items])
+    for order_item in order.order_items:
+        autocomplete.add_popularity(PRODUCT, order_item.product_id, order_item.quantity)
 
     return order
 
 
-def list_orders(current_user: User = Depends(require_role([UserRole.CUSTOMER, UserRole.SELLER, UserRole.ADMIN])), db: Session = Depends(get_db)):
-    order = db.query(Order).filter(Order.customer_id == current_user.id).all()
+async def list_orders(current_user: User = Depends(require_role([UserRole.CUSTOMER, UserRole.SELLER, UserRole.ADMIN])), skip: int = 0, limit: int = 50, cursor: Optional[str] = None, db: AsyncSession = Depends(get_async_db)):
+    keys = [Order.created_at, Order.id]
+    query = (
+        select(Order)
+        .where(Order.customer_id == current_user.id)
+        .options(selectinload(Order.order_items))
+    )
+    order = await db.scalars(paginate(query, keys, cursor, limit, skip, descending=True))
    
     
-    return order
+    return get_page(order.all(), keys, limit)
 
 
 
@@ -0,0 +1,113 @@
+import base64
+import binascii
+import json
+import math
+from datetime import datetime
+from typing import Callable, Optional, Sequence
+from fastapi import HTTPException, Query, Response, status
+from sqlalchemy import DateTime, and_, or_
+
+
+MAX_PAGE_SIZE = 200
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+LimitParam = Query(50, ge=1, le=MAX_PAGE_SIZE)
+CursorParam = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header of the previous page")
+
+
+def invalid_cursor():
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def encode_cursor(values: Sequence) -> str:
+    payload = json.dumps([value.isoformat() if isinstance(value, datetime) else value for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _cursor_value(column, value):
+    # Each value must have its key column's type: a tampered cursor must
+    # not reach the database as e.g. a string compared with an integer id
+    if isinstance(column.type, DateTime):
+        try:
+            return datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            raise invalid_cursor()
+
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        python_type = None
+
+    if isinstance(value, bool) and python_type is not bool:
+        raise invalid_cursor()
+    if python_type is float and isinstance(value, (int, float)):
+        if not math.isfinite(value):
+            raise invalid_cursor()
+        return float(value)
+    if python_type is None or not isinstance(value, python_type):
+        raise invalid_cursor()
+    return value
+
+
+def decode_cursor(cursor: str, columns: Sequence) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, binascii.Error, UnicodeError):
+        raise invalid_cursor()
+
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise invalid_cursor()
+
+    return [_cursor_value(column, value) for column, value in zip(columns, values)]
+
+
+def _after(columns: Sequence, values: Sequence, descending: bool):
+    # (a, b) > (x, y) spelled out as a > x OR (a = x AND b > y), with a
+    # leading a >= x so the planner can range-scan an index on the first key.
+    def beyond(column, value):
+        return column < value if descending else column > value
+
+    def at_or_beyond(column, value):
+        return column <= value if descending else column >= value
+
+    clauses = []
+    for i, (column, value) in enumerate(zip(columns, values)):
+        equal = [columns[j] == values[j] for j in range(i)]
+        clauses.append(and_(*equal, beyond(column, value)))
+
+    if len(columns) == 1:
+        return clauses[0]
+    return and_(at_or_beyond(columns[0], values[0]), or_(*clauses))
+
+
+def paginate(query, columns: Sequence, cursor: Optional[str] = None, limit: int = 50, skip: int = 0, descending: bool = False):
+    """Order `query` by `columns` and restrict it to the page after `cursor`.
+
+    Works on both `select()` statements and legacy `Query` objects. One
+    extra row is fetched so `get_page` can tell whether there is a next
+    page. Without a cursor `skip` falls back to OFFSET paging.
+    """
+    query = query.order_by(*[column.desc() if descending else column.asc() for column in columns])
+
+    if cursor:
+        query = query.where(_after(columns, decode_cursor(cursor, columns), descending))
+    elif skip:
+        query = query.offset(skip)
+
+    return query.limit(limit + 1)
+
+
+def get_page(rows: Sequence, columns: Sequence, limit: int, key: Optional[Callable] = None):
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(key(last) if key else [getattr(last, column.key) for column in columns])
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]):
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
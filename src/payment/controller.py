@@ -1,10 +1,11 @@
-from fastapi import Depends, APIRouter
+from fastapi import Depends, APIRouter, Response
 from sqlalchemy.orm import Session
 from src.database.core import get_db
 from src.payment.models import PaymentCreate, PaymentResponse
 from src.entities.users import User, UserRole
 from src.auth.service import get_current_user, require_role
-from typing import List
+from typing import List, Optional
+from src.pagination import LimitParam, CursorParam, set_next_cursor
 from src.payment.service import process_payment, get_payment, get_payment_by_order, get_all_payment
 
 router = APIRouter(
@@ -14,8 +15,10 @@ router = APIRouter(
 
 
 @router.get("/", response_model=List[PaymentResponse])
-def get_all_payments(current_user: User = Depends(require_role([UserRole.CUSTOMER,UserRole.SELLER, UserRole.ADMIN])),db: Session = Depends(get_db)):
-    return get_all_payment(current_user, db)
+def get_all_payments(response: Response, current_user: User = Depends(require_role([UserRole.CUSTOMER,UserRole.SELLER, UserRole.ADMIN])), skip: int = 0, limit: int = LimitParam, cursor: Optional[str] = CursorParam, db: Session = Depends(get_db)):
+    payments, next_cursor = get_all_payment(current_user, skip, limit, cursor, db)
+    set_next_cursor(response, next_cursor)
+    return payments
 
 @router.post("/process", response_model=PaymentResponse)
 def process_payments(payment_data: PaymentCreate, current_user: User = Depends(require_role([UserRole.CUSTOMER, UserRole.SELLER, UserRole.ADMIN])), 
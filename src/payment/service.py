@@ -7,6 +7,8 @@ from src.payment.models import PaymentCreate
 from src.entities.users import User, UserRole
 import uuid
 from src.auth.service import require_role
+from src.pagination import paginate, get_page
+from typing import Optional
 
 
 def process_payment(payment_data: PaymentCreate, current_user: User = Depends(require_role([UserRole.CUSTOMER,UserRole.SELLER, UserRole.ADMIN])), db: Session = Depends(get_db)):
@@ -36,11 +38,12 @@ def process_payment(payment_data: PaymentCreate, current_user: User = Depends(re
     db.refresh(payment)
     return payment
 
-def get_all_payment(current_user: User = Depends(require_role([UserRole.CUSTOMER, UserRole.SELLER, UserRole.ADMIN])), db: Session = Depends(get_db)):
+def get_all_payment(current_user: User = Depends(require_role([UserRole.CUSTOMER, UserRole.SELLER, UserRole.ADMIN])), skip: int = 0, limit: int = 50, cursor: Optional[str] = None, db: Session = Depends(get_db)):
    
-    payments = db.query(Payment).all()
+    keys = [Payment.id]
+    payments = paginate(db.query(Payment), keys, cursor, limit, skip).all()
     
-    return payments
+    return get_page(payments, keys, limit)
 
 
 def get_payment(payment_id: int, current_user: User = Depends(require_role([UserRole.CUSTOMER, UserRole.SELLER, UserRole.ADMIN])), db: Session = Depends(get_db)):
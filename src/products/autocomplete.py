@@ -0,0 +1,262 @@
+import bisect
+import heapq
+import re
+import sys
+import threading
+from typing import Optional
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from src.entities.products import Product
+from src.entities.category import Category
+
+
+MAX_SUGGESTIONS = 10
+SCAN_LIMIT = 64
+WORD_RE = re.compile(r"[^\W_]+")
+
+PRODUCT = "product"
+CATEGORY = "category"
+
+
+def normalize(text: Optional[str]) -> str:
+    return " ".join(WORD_RE.findall(text.casefold())) if text else ""
+
+
+def word_suffixes(normalized: str) -> set:
+    starts = [0] + [i + 1 for i, char in enumerate(normalized) if char == " "]
+    return {normalized[start:] for start in starts}
+
+
+class AutocompleteIndex:
+    """Typeahead over product and category names, ranked by popularity.
+
+    Every word of a name starts a suffix, so "phone" finds "Red Phone
+    Case". Suffixes live in one sorted list and a prefix lookup is a
+    bisect for its range. Small ranges are ranked on the fly; prefixes
+    matching more than SCAN_LIMIT suffixes keep a precomputed top list
+    that writes update in place.
+    """
+
+    def __init__(self):
+        self._suffixes = []
+        self._entries = {}
+        self._top = {}
+        self._lock = threading.Lock()
+        self.ready = False
+
+    def _rank(self, key):
+        label, _, popularity = self._entries[key]
+        return (-popularity, len(label), label, key)
+
+    def _range(self, prefix: str):
+        return (
+            bisect.bisect_left(self._suffixes, (prefix,)),
+            bisect.bisect_left(self._suffixes, (prefix + "\U0010ffff",))
+        )
+
+    def _best(self, keys) -> tuple:
+        return tuple(heapq.nsmallest(MAX_SUGGESTIONS, set(keys), key=self._rank))
+
+    def _compute_top(self, prefix: str, lo: int, hi: int) -> tuple:
+        # Built from the top lists of the one-character-longer prefixes, so
+        # only small child ranges are scanned; large ones are cached first.
+        keys = []
+        while lo < hi:
+            suffix, key = self._suffixes[lo]
+            if len(suffix) == len(prefix):
+                keys.append(key)
+                lo += 1
+                continue
+
+            child = suffix[:len(prefix) + 1]
+            child_hi = bisect.bisect_left(self._suffixes, (child + "\U0010ffff",), lo, hi)
+            top = self._top.get(child)
+            if top is None and child_hi - lo > SCAN_LIMIT:
+                top = self._compute_top(child, lo, child_hi)
+            keys.extend(top if top is not None else (key for _, key in self._suffixes[lo:child_hi]))
+            lo = child_hi
+
+        top = self._best(keys)
+        self._top[prefix] = top
+        return top
+
+    def _prefixes(self, normalized: str) -> set:
+        return {suffix[:length] for suffix in word_suffixes(normalized) for length in range(1, len(suffix) + 1)}
+
+    def _insert(self, key, label: str, popularity: int):
+        normalized = normalize(label)
+        if not normalized:
+            return
+
+        self._entries[key] = (label, normalized, popularity)
+        for suffix in word_suffixes(normalized):
+            bisect.insort(self._suffixes, (suffix, key))
+        self._promote(key, normalized)
+
+    def _promote(self, key, normalized: str):
+        # The entry only got better, so it can only move into top lists
+        for prefix in self._prefixes(normalized):
+            top = self._top.get(prefix)
+            if top is not None:
+                self._top[prefix] = self._best(top + (key,))
+
+    def _demote(self, key, normalized: str):
+        # The entry got worse or left; lists it was in need a rebuild,
+        # longest prefix first so each one sees up-to-date children.
+        for prefix in sorted(self._prefixes(normalized), key=len, reverse=True):
+            top = self._top.get(prefix)
+            if top is not None and key in top:
+                lo, hi = self._range(prefix)
+                if hi - lo > SCAN_LIMIT:
+                    self._compute_top(prefix, lo, hi)
+                else:
+                    del self._top[prefix]
+
+    def _delete(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+
+        for suffix in word_suffixes(entry[1]):
+            i = bisect.bisect_left(self._suffixes, (suffix, key))
+            if i < len(self._suffixes) and self._suffixes[i] == (suffix, key):
+                del self._suffixes[i]
+        self._demote(key, entry[1])
+        del self._entries[key]
+
+    def rebuild(self, db: Session):
+        in_category = dict(db.execute(
+            select(Product.category_id, func.count(Product.id)).where(Product.is_active == True).group_by(Product.category_id)
+        ).all())
+        categories = db.execute(select(Category.id, Category.name)).all()
+        products = db.execute(
+            select(Product.id, Product.name, Product.sales_count).where(Product.is_active == True).execution_options(yield_per=5000)
+        )
+
+        entries = {}
+        for product_id, name, sales_count in products:
+            entries[(PRODUCT, product_id)] = (name, normalize(name), sales_count or 0)
+        for category_id, name in categories:
+            entries[(CATEGORY, category_id)] = (name, normalize(name), in_category.get(category_id) or 0)
+        entries = {key: entry for key, entry in entries.items() if entry[1]}
+
+        with self._lock:
+            self._entries = entries
+            self._suffixes = sorted((suffix, key) for key, entry in entries.items() for suffix in word_suffixes(entry[1]))
+            self._rebuild_tops()
+            self.ready = True
+
+    def _rebuild_tops(self):
+        # Precompute top lists for every prefix too common to scan
+        self._top = {}
+        if len(self._suffixes) > SCAN_LIMIT:
+            self._compute_top("", 0, len(self._suffixes))
+            del self._top[""]
+
+    def add_many(self, kind: str, items):
+        """Add many new (id, label, popularity) entries in one pass.
+
+        Cheaper than repeated upserts for bulk writes: the new suffixes are
+        merged into the sorted list once and the top lists rebuilt once.
+        """
+        if not self.ready:
+            return
+
+        with self._lock:
+            added = []
+            for entry_id, label, popularity in items:
+                key = (kind, entry_id)
+                if key in self._entries:
+                    self._delete(key)
+                normalized = normalize(label)
+                if normalized:
+                    self._entries[key] = (label, normalized, popularity or 0)
+                    added.extend((suffix, key) for suffix in word_suffixes(normalized))
+            if added:
+                self._suffixes = sorted(self._suffixes + added)
+                self._rebuild_tops()
+
+    def upsert(self, kind: str, entry_id: int, label: str, popularity: Optional[int] = None):
+        if not self.ready:
+            return
+
+        key = (kind, entry_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] == label and popularity in (None, entry[2]):
+                    return
+                if popularity is None:
+                    popularity = entry[2]
+            self._delete(key)
+            self._insert(key, label, popularity or 0)
+
+    def remove(self, kind: str, entry_id: int):
+        if not self.ready:
+            return
+
+        with self._lock:
+            self._delete((kind, entry_id))
+
+    def add_popularity(self, kind: str, entry_id: int, amount: int):
+        if not self.ready or not amount:
+            return
+
+        key = (kind, entry_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            self._entries[key] = (entry[0], entry[1], max(entry[2] + amount, 0))
+            if amount > 0:
+                self._promote(key, entry[1])
+            else:
+                self._demote(key, entry[1])
+
+    def suggest(self, prefix: str, limit: int = MAX_SUGGESTIONS) -> list:
+        query = normalize(prefix)
+        if not query:
+            return []
+
+        with self._lock:
+            top = self._top.get(query)
+            if top is None:
+                lo, hi = self._range(query)
+                if hi - lo > SCAN_LIMIT:
+                    top = self._compute_top(query, lo, hi)
+                else:
+                    top = self._best(key for _, key in self._suffixes[lo:hi])
+
+            return [
+                {"type": kind, "id": entry_id, "name": self._entries[(kind, entry_id)][0]}
+                for kind, entry_id in top[:limit]
+            ]
+
+    def stats(self) -> dict:
+        """Entry counts plus an estimate of the index's memory use.
+
+        Sizes every object in the index, so it is meant for the admin
+        health endpoint, not the request path.
+        """
+        with self._lock:
+            suffix_bytes = sys.getsizeof(self._suffixes) + sum(
+                sys.getsizeof(item) + sys.getsizeof(item[0]) for item in self._suffixes
+            )
+            entry_bytes = sys.getsizeof(self._entries) + sum(
+                sys.getsizeof(key) + sys.getsizeof(entry) + sys.getsizeof(entry[0]) + sys.getsizeof(entry[1])
+                for key, entry in self._entries.items()
+            )
+            top_bytes = sys.getsizeof(self._top) + sum(
+                sys.getsizeof(prefix) + sys.getsizeof(top) for prefix, top in self._top.items()
+            )
+
+            return {
+                "ready": self.ready,
+                "entries": len(self._entries),
+                "suffixes": len(self._suffixes),
+                "cached_prefixes": len(self._top),
+                "approx_bytes": suffix_bytes + entry_bytes + top_bytes
+            }
+
+
+autocomplete = AutocompleteIndex()
@@ -0,0 +1,74 @@
+import threading
+from typing import Iterable
+from src.cache import TTLCache, SingleFlight
+from src.settings import get_settings
+
+
+_MISSING = object()
+
+
+class CatalogCache:
+    """Read-through cache for single products and product listing pages.
+
+    Values are Pydantic models, never ORM objects, so they can be shared
+    across requests. Concurrent misses for one key run a single load. Any
+    invalidation bumps a generation counter and loads that started before
+    it do not store their (possibly stale) result. With `bypass` the loader
+    runs on its own and its result is not stored, for callers that must
+    see their own writes.
+    """
+
+    def __init__(self, ttl_seconds: float, max_products: int, max_pages: int):
+        self.products = TTLCache(max_size=max_products, ttl_seconds=ttl_seconds)
+        self.pages = TTLCache(max_size=max_pages, ttl_seconds=ttl_seconds)
+        self._flight = SingleFlight()
+        self._lock = threading.Lock()
+        self.generation = 0
+
+    async def _get(self, cache: TTLCache, key, loader, bypass: bool):
+        if bypass:
+            return await loader()
+
+        value = cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        async def load():
+            generation = self.generation
+            value = await loader()
+            if generation == self.generation:
+                cache.set(key, value)
+            return value
+
+        return await self._flight.do((id(cache), key), load)
+
+    async def get_product(self, product_id: int, loader, bypass: bool = False):
+        return await self._get(self.products, product_id, loader, bypass)
+
+    async def get_page(self, key, loader, bypass: bool = False):
+        return await self._get(self.pages, key, loader, bypass)
+
+    def invalidate_products(self, product_ids: Iterable[int] = ()):
+        """Drop the given products and every listing page."""
+        with self._lock:
+            self.generation += 1
+        for product_id in product_ids:
+            self.products.invalidate(product_id)
+        self.pages.clear()
+
+    def stats(self) -> dict:
+        return {
+            "generation": self.generation,
+            "products": self.products.stats(),
+            "pages": self.pages.stats(),
+            "loads": self._flight.loads,
+            "coalesced": self._flight.coalesced
+        }
+
+
+settings = get_settings()
+catalog_cache = CatalogCache(
+    ttl_seconds=settings.catalog_cache_ttl_seconds,
+    max_products=settings.catalog_cache_max_products,
+    max_pages=settings.catalog_cache_max_pages
+)
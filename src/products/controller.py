@@ -1,13 +1,18 @@
-from fastapi import APIRouter, Depends, File, UploadFile, Form, HTTPException
-from src.products.models import ProductResponse
-from src.products.service import create_product, list_products, get_product, update_product, delete_product, get_product_review, upload_product_image
+from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, File, UploadFile, Form, HTTPException, Request, Response, Query
+from src.products.models import ProductResponse, SuggestionResponse, ProductFilters, ProductSort, ProductFacets, ProductImportResponse, ProductPatch, ProductBulkUpdateResponse
+from src.products.service import import_products, bulk_update_products, create_product, list_products, get_product_facets, search_products, suggest_products, get_product, update_product, delete_product, get_product_review, stream_product_reviews, upload_product_image
 from sqlalchemy.orm import Session
-from src.database.core import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.database.core import get_db, get_read_db, get_async_read_db
 from src.entities.users import User
 from src.users.models import UserRole
-from typing import List, Optional
-from src.auth.service import require_role, get_current_user
-from src.review.models import ReviewResponse
+from typing import List, Literal, Optional
+from src.auth.service import require_role, get_current_user, principal_cache
+from src.review.models import ReviewResponse, ReviewSort
+from src.pagination import LimitParam, CursorParam, set_next_cursor
+from src.products.autocomplete import MAX_SUGGESTIONS
+from src.http_cache import not_modified, etag_for, LIST_CACHE_CONTROL, PRODUCT_CACHE_CONTROL, REVIEW_CACHE_CONTROL
 
 router = APIRouter(
     tags=["Products"],
@@ -49,49 +54,117 @@ def become_seller(
         )
     
     # Upgrade customer to seller
-    current_user.role = UserRole.SELLER
+    user = db.query(User).filter(User.id == current_user.id).first()
+    user.role = UserRole.SELLER
     db.commit()
-    db.refresh(current_user)
+    db.refresh(user)
+    principal_cache.invalidate(user.id)
     
     return {
         "message": "Congratulations! You are now a seller!",
-        "user_id": current_user.id,
-        "username": current_user.username,
+        "user_id": user.id,
+        "username": user.username,
         "note": "You can now create and sell products"
     }
 
 @router.post("/", response_model=ProductResponse)
-async def create_products(
+def create_products(
     name: str = Form(...),
     description: Optional[str] = Form(None),
     price: float = Form(...),
     stock: int = Form(...),
     category_id: int = Form(...),
     image: Optional[UploadFile] = File(None),
+    background_tasks: BackgroundTasks = None,
     current_user: User = Depends(require_role([UserRole.SELLER, UserRole.ADMIN])),
     db: Session = Depends(get_db)
 ):
-    data = create_product(name, description, price, stock, category_id, image, current_user, db)
+    data = create_product(name, description, price, stock, category_id, image, background_tasks, current_user, db)
 
-    return await data
+    return data
+
+
+@router.post("/import", response_model=ProductImportResponse)
+def import_product_file(
+    file: UploadFile = File(..., description="CSV with a header row, or JSON Lines; fields as in ProductImport"),
+    format: Optional[Literal["csv", "jsonl"]] = Query(None, description="Defaults to the file extension"),
+    current_user: User = Depends(require_role([UserRole.SELLER, UserRole.ADMIN])),
+    db: Session = Depends(get_db)
+):
+    return import_products(file, format, current_user, db)
+
+
+@router.patch("/bulk", response_model=ProductBulkUpdateResponse)
+def bulk_update_product(
+    patches: List[ProductPatch] = Body(..., min_length=1, max_length=10000),
+    current_user: User = Depends(require_role([UserRole.SELLER, UserRole.ADMIN])),
+    db: Session = Depends(get_db)
+):
+    """Update price, stock and/or is_active of many products at once. Omitted fields are left as is."""
+    return bulk_update_products(patches, current_user, db)
 
 
 @router.get("/", response_model=List[ProductResponse])
-def list_of_products(current_user: User = Depends(require_role([UserRole.SELLER, UserRole.ADMIN])), skip: int = 0, limit: int = 50, db: Session = Depends(get_db)):
-    data = list_products(current_user, skip, limit, db)
+async def list_of_products(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(require_role([UserRole.SELLER, UserRole.ADMIN])),
+    skip: int = 0,
+    limit: int = LimitParam,
+    cursor: Optional[str] = CursorParam,
+    filters: ProductFilters = Depends(),
+    sort: ProductSort = ProductSort.ID,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    data, next_cursor = await list_products(current_user, skip, limit, cursor, filters, sort, db)
+    set_next_cursor(response, next_cursor)
+
+    return not_modified(request, response, etag_for(data, next_cursor), LIST_CACHE_CONTROL) or data
+
+@router.get("/facets", response_model=ProductFacets)
+async def product_facets(
+    filters: ProductFilters = Depends(),
+    current_user: User = Depends(require_role([UserRole.SELLER, UserRole.ADMIN])),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    return await get_product_facets(filters, current_user, db)
+
+@router.get("/search", response_model=List[ProductResponse])
+async def search_all_products(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    category_id: Optional[int] = None,
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    is_active: Optional[bool] = True,
+    limit: int = LimitParam,
+    cursor: Optional[str] = CursorParam,
+    current_user: User = Depends(require_role([UserRole.CUSTOMER, UserRole.SELLER, UserRole.ADMIN])),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    data, next_cursor = await search_products(q, category_id, min_price, max_price, is_active, limit, cursor, current_user, db)
+    set_next_cursor(response, next_cursor)
 
     return data
 
+@router.get("/autocomplete", response_model=List[SuggestionResponse])
+async def autocomplete_products(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=MAX_SUGGESTIONS),
+    current_user: User = Depends(require_role([UserRole.CUSTOMER, UserRole.SELLER, UserRole.ADMIN]))
+):
+    return suggest_products(q, limit, current_user)
+
 @router.get("/{product_id}", response_model=ProductResponse)
-def get_products(product_id: int, current_user: User = Depends(require_role([UserRole.SELLER, UserRole.ADMIN])), db: Session = Depends(get_db)):
+async def get_products(request: Request, response: Response, product_id: int, current_user: User = Depends(require_role([UserRole.SELLER, UserRole.ADMIN])), db: AsyncSession = Depends(get_async_read_db)):
 
-    data = get_product(product_id, current_user, db)
+    data = await get_product(product_id, current_user, db)
 
-    return data
+    return not_modified(request, response, etag_for([data]), PRODUCT_CACHE_CONTROL) or data
 
 
 @router.put("/{product_id}", response_model=ProductResponse)
-async def update_products(
+def update_products(
     product_id: int,
     name: Optional[str] = Form(None),
     description: Optional[str] = Form(None),
@@ -99,13 +172,14 @@ async def update_products(
     stock: Optional[int] = Form(None),
     category_id: Optional[int] = Form(None),
     image: Optional[UploadFile] = File(None),
+    background_tasks: BackgroundTasks = None,
     current_user: User = Depends(require_role([UserRole.SELLER, UserRole.ADMIN])),
     db: Session = Depends(get_db)
 ):
     
-    data = update_product(product_id, name, description, price, stock, category_id, image, current_user, db)
+    data = update_product(product_id, name, description, price, stock, category_id, image, background_tasks, current_user, db)
 
-    return await data
+    return data
 
 
 @router.delete("/{product_id}")
@@ -118,12 +192,32 @@ def delete_products(product_id: int, current_user: User = Depends(require_role([
 
 
 @router.post("/upload/product-image")
-async def upload_product_images(file: UploadFile = File(...), current_user: User = Depends(require_role([UserRole.SELLER, UserRole.ADMIN])), db: Session = Depends(get_db)):
-    return await upload_product_image(file, current_user, db)
+def upload_product_images(file: UploadFile = File(...), current_user: User = Depends(require_role([UserRole.SELLER, UserRole.ADMIN])), db: Session = Depends(get_db)):
+    return upload_product_image(file, current_user, db)
 
 
 @router.get("/{product_id}/reviews", response_model=List[ReviewResponse])
-def get_product_reviews(product_id: int, current_user: User = Depends(require_role([UserRole.SELLER, UserRole.ADMIN])), db: Session = Depends(get_db)):
-    data = get_product_review(product_id, current_user, db)
-    return data
+def get_product_reviews(
+    request: Request,
+    response: Response,
+    product_id: int,
+    current_user: User = Depends(require_role([UserRole.SELLER, UserRole.ADMIN])),
+    skip: int = 0,
+    limit: int = LimitParam,
+    cursor: Optional[str] = CursorParam,
+    sort: ReviewSort = ReviewSort.NEWEST,
+    format: Literal["json", "ndjson"] = Query("json", description="ndjson streams every review, one JSON object per line"),
+    db: Session = Depends(get_read_db)
+):
+    if format == "ndjson":
+        return StreamingResponse(
+            stream_product_reviews(product_id, sort),
+            media_type="application/x-ndjson",
+            headers={"Cache-Control": REVIEW_CACHE_CONTROL}
+        )
+
+    data, next_cursor = get_product_review(product_id, current_user, skip, limit, cursor, sort, db)
+    set_next_cursor(response, next_cursor)
+
+    return not_modified(request, response, etag_for(data, next_cursor), REVIEW_CACHE_CONTROL) or data
 
@@ -1,13 +1,15 @@
-from pydantic import BaseModel, field_validator
-from typing import Optional
+from pydantic import BaseModel, Field, field_validator
+from typing import Dict, List, Optional, Literal
+from enum import Enum
+from datetime import datetime
 
 
-class ProductCreate(BaseModel):
+class ProductImport(BaseModel):
+    """A product row of a bulk import; images are uploaded separately."""
     name: str
     description: Optional[str] = None
     price: float
     stock: int
-    image_url: Optional[str] = None
     category_id: int
 
     @field_validator('name')
@@ -46,6 +48,35 @@ class ProductCreate(BaseModel):
             raise ValueError('Stock must not exceed 1,000,000')
         return v
 
+
+class ProductCreate(ProductImport):
+    image_url: Optional[str] = None
+
+
+class ProductPatch(BaseModel):
+    id: int
+    price: Optional[float] = None
+    stock: Optional[int] = None
+    is_active: Optional[bool] = None
+
+    @field_validator('price')
+    @classmethod
+    def validate_price(cls, v):
+        return None if v is None else ProductCreate.validate_price(v)
+
+    @field_validator('stock')
+    @classmethod
+    def validate_stock(cls, v):
+        return None if v is None else ProductCreate.validate_stock(v)
+
+
+class ImageVariant(BaseModel):
+    width: int
+    height: int
+    webp: str
+    jpeg: str
+
+
 class ProductResponse(BaseModel):
     id: int
     name: str
@@ -53,10 +84,79 @@ class ProductResponse(BaseModel):
     price: float
     stock: int
     image_url: Optional[str]
+    image_variants: Optional[Dict[str, ImageVariant]] = None
     category_id: Optional[int] = None 
     seller_id: int
     is_active: bool
+    updated_at: Optional[datetime] = None
+    rating_count: int = 0
+    rating_average: Optional[float] = None
+    rating_histogram: List[int] = Field(default_factory=lambda: [0] * 5, description="Review counts for 1 to 5 stars")
     
     class Config:
         from_attributes = True
-        
\ No newline at end of file
+
+
+class SuggestionResponse(BaseModel):
+    type: Literal["product", "category"]
+    id: int
+    name: str
+
+
+class ProductSort(str, Enum):
+    ID = "id"
+    NEWEST = "newest"
+    PRICE_ASC = "price_asc"
+    PRICE_DESC = "price_desc"
+    POPULARITY = "popularity"
+
+
+class ProductFilters(BaseModel):
+    category_id: Optional[int] = None
+    seller_id: Optional[int] = None
+    min_price: Optional[float] = Field(None, ge=0)
+    max_price: Optional[float] = Field(None, ge=0)
+    in_stock: bool = False
+    min_rating: Optional[float] = Field(None, ge=1, le=5)
+
+
+class FacetCount(BaseModel):
+    id: int
+    count: int
+
+
+class PriceRangeCount(BaseModel):
+    min_price: float
+    max_price: Optional[float]
+    count: int
+
+
+class ProductFacets(BaseModel):
+    total: int
+    in_stock: int
+    categories: List[FacetCount]
+    sellers: List[FacetCount]
+    price_ranges: List[PriceRangeCount]
+
+
+class ImportRowError(BaseModel):
+    row: int
+    errors: List[str]
+
+
+class ProductImportResponse(BaseModel):
+    inserted: int
+    failed: int
+    errors: List[ImportRowError]
+    errors_truncated: bool
+
+
+class BulkUpdateError(BaseModel):
+    id: int
+    error: str
+
+
+class ProductBulkUpdateResponse(BaseModel):
+    updated: int
+    failed: int
+    errors: List[BulkUpdateError]
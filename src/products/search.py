@@ -0,0 +1,159 @@
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from src.entities.products import Product
+
+
+TOKEN_RE = re.compile(r"[^\W_]+")
+NAME_WEIGHT = 3
+K1 = 1.2
+B = 0.75
+
+
+def tokenize(text: Optional[str]) -> list:
+    return TOKEN_RE.findall(text.lower()) if text else []
+
+
+class ProductSearchIndex:
+    """In-process inverted index over product names and descriptions.
+
+    Used where the database has no full-text index (SQLite). Postings map
+    each term to {product_id: term frequency}; name terms count
+    NAME_WEIGHT times. Matches need every query term and are ranked with
+    BM25. Each worker keeps its own copy, built at startup and updated by
+    the product service.
+    """
+
+    def __init__(self):
+        self._postings = {}
+        self._docs = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+        self.ready = False
+
+    def rebuild(self, db: Session, batch_size: int = 5000):
+        rows = db.execute(
+            select(Product.id, Product.name, Product.description, Product.category_id, Product.price, Product.is_active)
+            .execution_options(yield_per=batch_size)
+        )
+        with self._lock:
+            self._postings = {}
+            self._docs = {}
+            self._total_length = 0
+            for row in rows:
+                self._add(row)
+            self.ready = True
+
+    def add(self, product):
+        if not self.ready:
+            return
+
+        with self._lock:
+            self._remove(product.id)
+            self._add(product)
+
+    def remove(self, product_id: int):
+        if not self.ready:
+            return
+
+        with self._lock:
+            self._remove(product_id)
+
+    def _add(self, product):
+        terms = Counter(tokenize(product.description))
+        for term in tokenize(product.name):
+            terms[term] += NAME_WEIGHT
+
+        for term, frequency in terms.items():
+            self._postings.setdefault(term, {})[product.id] = frequency
+
+        length = sum(terms.values())
+        self._docs[product.id] = (tuple(terms), length, product.category_id, product.price, product.is_active)
+        self._total_length += length
+
+    def _remove(self, product_id: int):
+        doc = self._docs.pop(product_id, None)
+        if doc is None:
+            return
+
+        terms, length = doc[0], doc[1]
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(product_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= length
+
+    def search(
+        self,
+        query: str,
+        limit: int,
+        after: Optional[tuple] = None,
+        category_id: Optional[int] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        is_active: Optional[bool] = True
+    ) -> list:
+        """Return up to `limit` (score, product_id) pairs, best first.
+
+        `after` is the (score, product_id) of the last hit on the previous
+        page; only hits that sort after it are returned.
+        """
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+
+        with self._lock:
+            postings = [self._postings.get(term) for term in terms]
+            if not all(postings):
+                return []
+            postings.sort(key=len)
+
+            n_docs = len(self._docs)
+            avg_length = self._total_length / n_docs
+            idf = [math.log(1 + (n_docs - len(p) + 0.5) / (len(p) + 0.5)) for p in postings]
+
+            hits = []
+            for product_id in postings[0]:
+                if not all(product_id in p for p in postings[1:]):
+                    continue
+
+                _, length, doc_category, price, active = self._docs[product_id]
+                if category_id is not None and doc_category != category_id:
+                    continue
+                if min_price is not None and price < min_price:
+                    continue
+                if max_price is not None and price > max_price:
+                    continue
+                if is_active is not None and bool(active) != is_active:
+                    continue
+
+                norm = K1 * (1 - B + B * length / avg_length)
+                score = 0.0
+                for weight, p in zip(idf, postings):
+                    frequency = p[product_id]
+                    score += weight * frequency * (K1 + 1) / (frequency + norm)
+                score = round(score, 6)
+
+                if after is not None and (score, product_id) >= after:
+                    continue
+                hits.append((score, product_id))
+
+        return heapq.nlargest(limit, hits)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "documents": len(self._docs),
+                "terms": len(self._postings)
+            }
+
+
+product_search = ProductSearchIndex()
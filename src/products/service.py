@@ -1,34 +1,120 @@
+from sqlalchemy import select, insert, update, func, column, case, Float
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.users.models import UserRole
-from src.entities.products import Product
+from src.entities.products import Product, SEARCH_CONFIG, search_document
 from src.entities.users import User
-from fastapi import HTTPException, status, Response, Depends, UploadFile, File, Form
+from src.entities.image_uploads import ImageUpload
+from fastapi import BackgroundTasks, HTTPException, status, Response, Depends, UploadFile, File, Form
 from src.auth.service import require_role
-from src.database.core import get_db
+from src.database.core import get_db, get_read_db, get_async_db, engine, SessionLocal, ReadSessionLocal, primary_pins
 from src.entities.reviews import Review
-from typing import Optional
+from src.review.models import ReviewResponse, ReviewSort
+from src.products.models import ProductImport, ProductPatch, ProductFilters, ProductSort, ProductResponse
+from src.entities.category import Category
+from src.products.cache import catalog_cache
+from typing import List, Optional
+from datetime import datetime
+from collections import Counter
+from pathlib import Path
+from pydantic import ValidationError
+import codecs
+import csv
+import json
 import os
-from src.upload_settings import save_upload_file, validate_image_file, PRODUCT_IMAGES_DIR
-from ..cloudinary_config import cloudinary
-import cloudinary.uploader
-from src.entities.images import Image
+from src.upload_settings import is_legacy_upload, PRODUCT_IMAGES_DIR, PRODUCT_VARIANTS_DIR
+from src.image_processing import image_pipeline, existing_variants
+from src.images.service import store_image, release_image, collect_orphans, enqueue_upload
+from src.pagination import paginate, get_page, decode_cursor
+from src.products.search import product_search
+from src.products.autocomplete import autocomplete, PRODUCT, CATEGORY
 
 
+def index_product(product: Product, previous_category_id: Optional[int] = None, was_active: bool = False):
+    """Bring the in-process caches and indexes up to date after a write."""
+    catalog_cache.invalidate_products([product.id])
+    product_search.add(product)
 
-async def create_product(
+    if product.is_active:
+        autocomplete.upsert(PRODUCT, product.id, product.name)
+    else:
+        autocomplete.remove(PRODUCT, product.id)
+
+    if was_active:
+        autocomplete.add_popularity(CATEGORY, previous_category_id, -1)
+    if product.is_active:
+        autocomplete.add_popularity(CATEGORY, product.category_id, 1)
+
+
+def process_product_image(product_id: int, image_path: str):
+    """Render the variants of a product's image and record them on the product.
+
+    Variant files are named after the image's digest, so products sharing
+    an image render it once.
+    """
+    stem = Path(image_path).stem
+    try:
+        variants = existing_variants(str(PRODUCT_VARIANTS_DIR), stem) or image_pipeline.render(image_path, str(PRODUCT_VARIANTS_DIR), stem)
+    except Exception as exc:
+        print(f"Image processing failed for product {product_id}: {exc}")
+        return
+
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            update(Product).where(Product.id == product_id, Product.image_url == image_path).values(image_variants=variants),
+            execution_options={"synchronize_session": False}
+        )
+        db.commit()
+    finally:
+        db.close()
+
+    # No match: the image was replaced meanwhile, and collect_orphans
+    # removes these variants along with it
+    if result.rowcount:
+        catalog_cache.invalidate_products([product_id])
+
+
+def schedule_image_processing(background_tasks: Optional[BackgroundTasks], product: Product):
+    if not product.image_url:
+        return
+    if background_tasks is None:
+        process_product_image(product.id, product.image_url)
+    else:
+        background_tasks.add_task(process_product_image, product.id, product.image_url)
+
+
+def schedule_orphan_collection(background_tasks: Optional[BackgroundTasks]):
+    if background_tasks is None:
+        collect_orphans()
+    else:
+        background_tasks.add_task(collect_orphans)
+
+
+def release_stored_image(image_id: int, db: Session):
+    """Give back the reference store_image took when the product that was to use it is not saved."""
+    try:
+        release_image(image_id, db)
+        db.commit()
+    except Exception as exc:
+        db.rollback()
+        print(f"Could not release image {image_id}: {exc}")
+
+
+def create_product(
     name: str = Form(...),
     description: Optional[str] = Form(None),
     price: float = Form(...),
     stock: int = Form(...),
     category_id: int = Form(...),
     image: Optional[UploadFile] = File(None),
+    background_tasks: Optional[BackgroundTasks] = None,
     current_user: User = Depends(require_role([UserRole.SELLER, UserRole.ADMIN])),
     db: Session = Depends(get_db)
 ):
-    image_url = None
+    stored = None
     if image:
-        validate_image_file(image)
-        image_url = save_upload_file(image, PRODUCT_IMAGES_DIR)
+        stored = store_image(image, PRODUCT_IMAGES_DIR, db)
     
     db_product = Product(
         name=name,
@@ -37,28 +123,205 @@ async def create_product(
         stock=stock,
         category_id=category_id,
         seller_id=current_user.id,
-        image_url=image_url
+        image_id=stored.id if stored else None,
+        image_url=stored.path if stored else None
     )
     db.add(db_product)
-    db.commit()
+    try:
+        db.commit()
+    except Exception:
+        # store_image already committed its reference; give it back
+        db.rollback()
+        if stored:
+            release_stored_image(stored.id, db)
+        raise
     db.refresh(db_product)
+    index_product(db_product)
+    schedule_image_processing(background_tasks, db_product)
 
     return db_product
 
 
-def list_products(current_user: User = Depends(require_role([UserRole.SELLER, UserRole.ADMIN])), skip: int  = 0, limit: int = 50, db: Session = Depends(get_db)):
-    return db.query(Product).filter(Product.is_active == True).offset(skip).limit(limit).all()
+# Sort key columns and direction; each has a matching partial index on
+# active products, alone and behind category_id.
+PRODUCT_SORTS = {
+    ProductSort.ID: ([Product.id], False),
+    ProductSort.NEWEST: ([Product.created_at, Product.id], True),
+    ProductSort.PRICE_ASC: ([Product.price, Product.id], False),
+    ProductSort.PRICE_DESC: ([Product.price, Product.id], True),
+    ProductSort.POPULARITY: ([Product.sales_count, Product.id], True),
+}
 
+PRICE_BUCKETS = [0, 25, 50, 100, 250, 500, 1000]
+
+
+def product_filter_clauses(filters: Optional[ProductFilters]) -> list:
+    clauses = [Product.is_active == True]
+    if filters is None:
+        return clauses
+
+    if filters.category_id is not None:
+        clauses.append(Product.category_id == filters.category_id)
+    if filters.seller_id is not None:
+        clauses.append(Product.seller_id == filters.seller_id)
+    if filters.min_price is not None:
+        clauses.append(Product.price >= filters.min_price)
+    if filters.max_price is not None:
+        clauses.append(Product.price <= filters.max_price)
+    if filters.in_stock:
+        clauses.append(Product.stock > 0)
+    if filters.min_rating is not None:
+        clauses.append(Product.rating_count > 0)
+        clauses.append(Product.rating_sum >= filters.min_rating * Product.rating_count)
+
+    return clauses
+
+
+async def list_products(
+    current_user: User = Depends(require_role([UserRole.SELLER, UserRole.ADMIN])),
+    skip: int  = 0,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    filters: Optional[ProductFilters] = None,
+    sort: ProductSort = ProductSort.ID,
+    db: AsyncSession = Depends(get_async_db)
+):
+    filters = filters or ProductFilters()
+    keys, descending = PRODUCT_SORTS[sort]
+
+    async def load():
+        query = paginate(select(Product).where(*product_filter_clauses(filters)), keys, cursor, limit, skip, descending)
+        result = await db.scalars(query)
+        page, next_cursor = get_page(result.all(), keys, limit)
+        return [ProductResponse.model_validate(product) for product in page], next_cursor
+
+    cache_key = ("list", tuple(filters.model_dump().items()), sort.value, skip, limit, cursor)
+    # A client pinned to the primary neither reads nor fills the shared cache
+    return await catalog_cache.get_page(cache_key, load, bypass=primary_pins.is_pinned())
+
+
+async def get_product_facets(
+    filters: Optional[ProductFilters] = None,
+    current_user: User = Depends(require_role([UserRole.SELLER, UserRole.ADMIN])),
+    db: AsyncSession = Depends(get_async_db)
+):
+    filters = filters or ProductFilters()
+    return await catalog_cache.get_page(("facets", tuple(filters.model_dump().items())), lambda: _load_facets(filters, db), bypass=primary_pins.is_pinned())
+
+
+async def _load_facets(filters: ProductFilters, db: AsyncSession):
+    # One GROUP BY over every facet combination; the per-facet counts are
+    # summed up here instead of running one query per facet.
+    bucket = case(
+        *[(Product.price < upper, i) for i, upper in enumerate(PRICE_BUCKETS[1:])],
+        else_=len(PRICE_BUCKETS) - 1
+    )
+    in_stock = Product.stock > 0
+    rows = await db.execute(
+        select(Product.category_id, Product.seller_id, bucket, in_stock, func.count())
+        .where(*product_filter_clauses(filters))
+        .group_by(Product.category_id, Product.seller_id, bucket, in_stock)
+    )
+
+    total = 0
+    in_stock_count = 0
+    categories, sellers, buckets = {}, {}, {}
+    for category_id, seller_id, price_bucket, has_stock, count in rows:
+        total += count
+        if has_stock:
+            in_stock_count += count
+        categories[category_id] = categories.get(category_id, 0) + count
+        sellers[seller_id] = sellers.get(seller_id, 0) + count
+        buckets[price_bucket] = buckets.get(price_bucket, 0) + count
+
+    def counts(values: dict) -> list:
+        return [{"id": key, "count": count} for key, count in sorted(values.items(), key=lambda item: -item[1]) if key is not None]
+
+    return {
+        "total": total,
+        "in_stock": in_stock_count,
+        "categories": counts(categories),
+        "sellers": counts(sellers),
+        "price_ranges": [
+            {
+                "min_price": PRICE_BUCKETS[i],
+                "max_price": PRICE_BUCKETS[i + 1] if i + 1 < len(PRICE_BUCKETS) else None,
+                "count": buckets[i]
+            }
+            for i in sorted(buckets)
+        ]
+    }
+
+
+SEARCH_KEYS = [column("rank", Float), Product.id]
+
+
+def uses_database_search() -> bool:
+    return engine.dialect.name == "postgresql"
 
-def get_product(product_id: int, current_user: User = Depends(require_role([UserRole.SELLER, UserRole.ADMIN])), db: Session = Depends(get_db)):
-    product = db.query(Product).filter(Product.id == product_id).first()
-    if not product:
-        raise HTTPException(status_code=404, detail="Product not found")
-    return product
 
+async def search_products(
+    q: str,
+    category_id: Optional[int] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    is_active: Optional[bool] = True,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    current_user: User = Depends(require_role([UserRole.CUSTOMER, UserRole.SELLER, UserRole.ADMIN])),
+    db: AsyncSession = Depends(get_async_db)
+):
+    if current_user.role == UserRole.CUSTOMER:
+        is_active = True
+
+    filters = []
+    if category_id is not None:
+        filters.append(Product.category_id == category_id)
+    if min_price is not None:
+        filters.append(Product.price >= min_price)
+    if max_price is not None:
+        filters.append(Product.price <= max_price)
+    if is_active is not None:
+        filters.append(Product.is_active == is_active)
+
+    if uses_database_search():
+        document = search_document(Product.name, Product.description)
+        query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+        rank = func.ts_rank_cd(document, query).label("rank")
+        statement = select(Product, rank).where(document.op("@@")(query), *filters)
+        rows = (await db.execute(paginate(statement, [rank, Product.id], cursor, limit, descending=True))).all()
+        page, next_cursor = get_page(rows, SEARCH_KEYS, limit, key=lambda row: [row.rank, row.Product.id])
+        return [row.Product for row in page], next_cursor
+
+    after = tuple(decode_cursor(cursor, SEARCH_KEYS)) if cursor else None
+    hits = product_search.search(q, limit + 1, after, category_id, min_price, max_price, is_active)
+    if not hits:
+        return [], None
+
+    # The index is per worker and may lag writes made by another one, so
+    # the filters are applied again to the rows actually loaded.
+    result = await db.scalars(select(Product).where(Product.id.in_([product_id for _, product_id in hits]), *filters))
+    products = {product.id: product for product in result.all()}
+    page, next_cursor = get_page(hits, SEARCH_KEYS, limit, key=list)
+    return [products[product_id] for _, product_id in page if product_id in products], next_cursor
+
+
+def suggest_products(q: str, limit: int = 10, current_user: User = Depends(require_role([UserRole.CUSTOMER, UserRole.SELLER, UserRole.ADMIN]))):
+    return autocomplete.suggest(q, limit)
 
 
-async def update_product(
+async def get_product(product_id: int, current_user: User = Depends(require_role([UserRole.SELLER, UserRole.ADMIN])), db: AsyncSession = Depends(get_async_db)):
+    async def load():
+        product = await db.get(Product, product_id)
+        if not product:
+            raise HTTPException(status_code=404, detail="Product not found")
+        return ProductResponse.model_validate(product)
+
+    return await catalog_cache.get_product(product_id, load, bypass=primary_pins.is_pinned())
+
+
+
+def update_product(
     product_id: int,
     name: Optional[str] = Form(None),
     description: Optional[str] = Form(None),
@@ -66,6 +329,7 @@ async def update_product(
     stock: Optional[int] = Form(None),
     category_id: Optional[int] = Form(None),
     image: Optional[UploadFile] = File(None),
+    background_tasks: Optional[BackgroundTasks] = None,
     current_user: User = Depends(require_role([UserRole.SELLER, UserRole.ADMIN])),
     db: Session = Depends(get_db)
 ):
@@ -76,6 +340,7 @@ async def update_product(
     if current_user.role != UserRole.ADMIN and db_product.seller_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
     
+    previous_category_id, was_active = db_product.category_id, db_product.is_active
     if name:
         db_product.name = name
     if description:
@@ -86,19 +351,123 @@ async def update_product(
         db_product.stock = stock
     if category_id:
         db_product.category_id = category_id
+    released = None
     if image:
-        validate_image_file(image)
-
-        if db_product.image_url and os.path.exists(db_product.image_url):
+        stored = store_image(image, PRODUCT_IMAGES_DIR, db)
+        released = db_product.image_id
+        if released:
+            release_image(released, db)
+        elif db_product.image_url and is_legacy_upload(db_product.image_url, PRODUCT_IMAGES_DIR) and os.path.exists(db_product.image_url):
             os.remove(db_product.image_url)
-        db_product.image_url = save_upload_file(image, PRODUCT_IMAGES_DIR)
-    
-    db.commit()
+        db_product.image_id = stored.id
+        db_product.image_url = stored.path
+        db_product.image_variants = None
+
+    try:
+        db.commit()
+    except Exception:
+        db.rollback()
+        if image:
+            release_stored_image(stored.id, db)
+        raise
     db.refresh(db_product)
+    index_product(db_product, previous_category_id, was_active)
+    if image:
+        schedule_image_processing(background_tasks, db_product)
+    if released:
+        schedule_orphan_collection(background_tasks)
 
     return db_product
 
 
+BULK_UPDATE_CHUNK_SIZE = 1000
+BULK_PATCH_FIELDS = ("price", "stock", "is_active")
+
+
+def bulk_update_products(
+    patches: List[ProductPatch],
+    current_user: User = Depends(require_role([UserRole.SELLER, UserRole.ADMIN])),
+    db: Session = Depends(get_db)
+):
+    """Apply price/stock/is_active patches with one UPDATE per chunk.
+
+    Each chunk is a single `UPDATE ... SET col = CASE id WHEN ... END
+    WHERE id IN (...)`, which works on SQLite and PostgreSQL alike. Rows
+    that are missing or owned by another seller are reported and skipped;
+    the rest commit together, then caches and indexes are updated once.
+    """
+    errors = []
+    seen = set()
+    pending = []
+    for patch in patches:
+        if patch.id in seen:
+            errors.append({"id": patch.id, "error": "Duplicate id in request"})
+            continue
+        seen.add(patch.id)
+        pending.append(patch)
+
+    updated_at = datetime.utcnow()
+    updated = []
+    previous = {}
+    for start in range(0, len(pending), BULK_UPDATE_CHUNK_SIZE):
+        chunk = pending[start:start + BULK_UPDATE_CHUNK_SIZE]
+        owners = {
+            row.id: row for row in db.execute(
+                select(Product.id, Product.seller_id, Product.category_id, Product.is_active)
+                .where(Product.id.in_([patch.id for patch in chunk]))
+            )
+        }
+
+        allowed = []
+        for patch in chunk:
+            owner = owners.get(patch.id)
+            if owner is None:
+                errors.append({"id": patch.id, "error": "Product not found"})
+            elif current_user.role != UserRole.ADMIN and owner.seller_id != current_user.id:
+                errors.append({"id": patch.id, "error": "Not authorized"})
+            else:
+                allowed.append(patch)
+                previous[patch.id] = owner
+
+        values = {"updated_at": updated_at}
+        for field in BULK_PATCH_FIELDS:
+            changes = {patch.id: getattr(patch, field) for patch in allowed if getattr(patch, field) is not None}
+            if changes:
+                values[field] = case(changes, value=Product.id, else_=getattr(Product, field))
+        if len(values) == 1:
+            continue
+
+        statement = update(Product).where(Product.id.in_([patch.id for patch in allowed]))
+        if current_user.role != UserRole.ADMIN:
+            statement = statement.where(Product.seller_id == current_user.id)
+        updated.extend(db.execute(
+            statement.values(**values).returning(
+                Product.id, Product.name, Product.description, Product.category_id,
+                Product.price, Product.is_active, Product.sales_count
+            ),
+            execution_options={"synchronize_session": False}
+        ).all())
+
+    db.commit()
+
+    if updated:
+        catalog_cache.invalidate_products([row.id for row in updated])
+        popularity = Counter()
+        for row in updated:
+            product_search.add(row)
+            was_active = previous[row.id].is_active
+            if row.is_active and not was_active:
+                autocomplete.upsert(PRODUCT, row.id, row.name, row.sales_count)
+                popularity[row.category_id] += 1
+            elif was_active and not row.is_active:
+                autocomplete.remove(PRODUCT, row.id)
+                popularity[row.category_id] -= 1
+        for category_id, amount in popularity.items():
+            autocomplete.add_popularity(CATEGORY, category_id, amount)
+
+    return {"updated": len(updated), "failed": len(errors), "errors": errors}
+
+
 def delete_product(product_id: int, current_user: User = Depends(require_role([UserRole.SELLER, UserRole.ADMIN])), 
                   db: Session = Depends(get_db)):
     db_product = db.query(Product).filter(Product.id == product_id).first()
@@ -108,40 +477,209 @@ def delete_product(product_id: int, current_user: User = Depends(require_role([U
     if current_user.role != UserRole.SELLER and db_product.seller_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
     
+    was_active = db_product.is_active
     db_product.is_active = False
     db.commit()
+    index_product(db_product, db_product.category_id, was_active)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
-def get_product_review(product_id: int, current_user: User = Depends(require_role([UserRole.SELLER, UserRole.ADMIN, UserRole.CUSTOMER])), db: Session = Depends(get_db)):
-    return db.query(Review).filter(Review.product_id == product_id).all()
+REVIEW_SORTS = {
+    ReviewSort.NEWEST: ([Review.created_at, Review.id], True),
+    ReviewSort.HIGHEST: ([Review.rating, Review.id], True),
+    ReviewSort.LOWEST: ([Review.rating, Review.id], False),
+}
+REVIEW_STREAM_BATCH_SIZE = 1000
 
 
-async def upload_product_image(file: UploadFile = File(...), current_user: User = Depends(require_role([UserRole.SELLER, UserRole.ADMIN])), db: Session = Depends(get_db)):
+def get_product_review(
+    product_id: int,
+    current_user: User = Depends(require_role([UserRole.SELLER, UserRole.ADMIN, UserRole.CUSTOMER])),
+    skip: int = 0,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    sort: ReviewSort = ReviewSort.NEWEST,
+    db: Session = Depends(get_read_db)
+):
+    keys, descending = REVIEW_SORTS[sort]
+    query = paginate(select(Review).where(Review.product_id == product_id), keys, cursor, limit, skip, descending)
+    return get_page(db.scalars(query).all(), keys, limit)
 
-        
-    validate_image_file(file)
 
-    
-    saved_path = save_upload_file(file, PRODUCT_IMAGES_DIR)
+def stream_product_reviews(product_id: int, sort: ReviewSort = ReviewSort.NEWEST):
+    """Yield every review of a product as NDJSON lines, in `sort` order.
 
-    
-    upload_result = cloudinary.uploader.upload(saved_path, folder="Uploading images")
+    Runs on its own session because the response body is produced after
+    the request's dependencies have finished. Rows are fetched in batches
+    with yield_per (a server-side cursor on PostgreSQL) and each batch is
+    released once written, so memory stays flat however many reviews exist.
+    """
+    keys, descending = REVIEW_SORTS[sort]
+    query = (
+        select(Review)
+        .where(Review.product_id == product_id)
+        .order_by(*[key.desc() if descending else key.asc() for key in keys])
+        .execution_options(yield_per=REVIEW_STREAM_BATCH_SIZE)
+    )
 
-    
-    image_url = upload_result.get("secure_url")
-    public_id = upload_result.get("public_id")
+    with ReadSessionLocal() as db:
+        for partition in db.scalars(query).partitions():
+            yield "".join(ReviewResponse.model_validate(review).model_dump_json() + "\n" for review in partition)
 
-    
-    image_record = Image(url=image_url, public_id=public_id)
-    db.add(image_record)
-    db.commit()
-    db.refresh(image_record)
+
+def upload_product_image(file: UploadFile = File(...), current_user: User = Depends(require_role([UserRole.SELLER, UserRole.ADMIN])), db: Session = Depends(get_db)):
+
+    # Bytes already stored (and uploaded) are reused, not uploaded again.
+    # Otherwise the upload happens in the background; poll /api/images/{id}
+    # The upload row holds the reference until DELETE /api/images/uploads/{id}
+    image_record = store_image(file, PRODUCT_IMAGES_DIR, db)
+    upload = ImageUpload(image_id=image_record.id, user_id=current_user.id)
+    db.add(upload)
+    image_record = enqueue_upload(image_record, "Uploading images", db)
 
     return {
-        "message": "Product image uploaded successfully",
-        "image_url": image_url,
-        "public_id": public_id,
-        "file_path": saved_path,
-        "id": image_record.id
-    }
\ No newline at end of file
+        "message": "Product image accepted for upload",
+        "status": image_record.status.value,
+        "image_url": image_record.url,
+        "public_id": image_record.public_id,
+        "file_path": image_record.path,
+        "id": image_record.id,
+        "upload_id": upload.id
+    }
+
+
+IMPORT_BATCH_SIZE = 5000
+MAX_IMPORT_ERRORS = 1000
+IMPORT_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+
+def decode_import_lines(binary, errors: list):
+    # Decodes line by line so one bad line does not end the import; it is
+    # reported in `errors` as (line_number, message) and read as blank.
+    for line_number, raw in enumerate(binary, start=1):
+        if line_number == 1:
+            raw = raw.removeprefix(codecs.BOM_UTF8)
+        try:
+            yield raw.decode("utf-8")
+        except UnicodeDecodeError as exc:
+            errors.append((line_number, f"Invalid UTF-8: {exc.reason}"))
+            yield "\n"
+
+
+def read_import_rows(file: UploadFile, format: str):
+    """Yield (row_number, data, error) for each record of a CSV or JSONL upload.
+
+    Reads the spooled upload incrementally, so memory stays flat whatever
+    the file size. Empty CSV cells are dropped so optional fields fall back
+    to their defaults. Undecodable or malformed lines are yielded as errors
+    rather than raised, since earlier batches are already committed.
+    """
+    decode_errors = []
+    lines = decode_import_lines(file.file, decode_errors)
+
+    def pending_errors():
+        while decode_errors:
+            row_number, error = decode_errors.pop(0)
+            yield row_number, None, error
+
+    if format == "csv":
+        reader = csv.DictReader(lines)
+        while True:
+            try:
+                row = next(reader)
+            except StopIteration:
+                break
+            except csv.Error as exc:
+                yield from pending_errors()
+                yield reader.line_num, None, f"Invalid CSV: {exc}"
+                continue
+            yield from pending_errors()
+            yield reader.line_num, {key: value for key, value in row.items() if key is not None and value != ""}, None
+    else:
+        for row_number, line in enumerate(lines, start=1):
+            yield from pending_errors()
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except ValueError:
+                yield row_number, None, "Invalid JSON"
+                continue
+            if not isinstance(data, dict):
+                yield row_number, None, "Expected a JSON object"
+                continue
+            yield row_number, data, None
+
+    yield from pending_errors()
+
+
+def import_products(
+    file: UploadFile = File(...),
+    format: Optional[str] = None,
+    current_user: User = Depends(require_role([UserRole.SELLER, UserRole.ADMIN])),
+    db: Session = Depends(get_db)
+):
+    format = format or IMPORT_FORMATS.get(Path(file.filename or "").suffix.lower())
+    if format not in IMPORT_FORMATS.values():
+        raise HTTPException(status_code=400, detail="Upload a .csv or .jsonl file or pass format=csv|jsonl")
+
+    category_ids = set(db.scalars(select(Category.id)))
+    report = {"inserted": 0, "failed": 0, "errors": [], "errors_truncated": False}
+    batch = []
+    inserted = []
+
+    def fail(row_number: int, errors: list):
+        report["failed"] += 1
+        if len(report["errors"]) < MAX_IMPORT_ERRORS:
+            report["errors"].append({"row": row_number, "errors": errors})
+        else:
+            report["errors_truncated"] = True
+
+    def flush():
+        # One multi-row INSERT per batch, committed so a bad batch late in
+        # the file does not roll back the rows before it
+        rows = db.execute(
+            insert(Product).returning(Product.id, Product.name, Product.description, Product.category_id, Product.price, Product.is_active),
+            batch
+        ).all()
+        db.commit()
+        for row in rows:
+            product_search.add(row)
+        inserted.extend((row.id, row.name, row.category_id) for row in rows if row.is_active)
+        report["inserted"] += len(rows)
+        batch.clear()
+
+    for row_number, data, error in read_import_rows(file, format):
+        if error:
+            fail(row_number, [error])
+            continue
+
+        if data.get("image_url"):
+            fail(row_number, ["image_url: Images cannot be imported; add them by updating the product"])
+            continue
+
+        try:
+            product = ProductImport(**data)
+        except ValidationError as exc:
+            fail(row_number, [f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in exc.errors()])
+            continue
+
+        if product.category_id not in category_ids:
+            fail(row_number, ["category_id: Category not found"])
+            continue
+
+        batch.append({**product.model_dump(), "seller_id": current_user.id})
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            flush()
+
+    if batch:
+        flush()
+
+    if report["inserted"]:
+        catalog_cache.invalidate_products()
+        autocomplete.add_many(PRODUCT, [(product_id, name, 0) for product_id, name, _ in inserted])
+        for category_id, count in Counter(category_id for _, _, category_id in inserted).items():
+            autocomplete.add_popularity(CATEGORY, category_id, count)
+
+    return report
+
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, validator
 from typing import Optional
 from datetime import datetime
+from enum import Enum
 
 
 class ReviewCreate(BaseModel):
@@ -23,4 +24,10 @@ class ReviewResponse(BaseModel):
     created_at: datetime
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class ReviewSort(str, Enum):
+    NEWEST = "newest"
+    HIGHEST = "highest"
+    LOWEST = "lowest"
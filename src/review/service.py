@@ -1,4 +1,7 @@
+from datetime import datetime
+from typing import Iterable, Optional
 from fastapi import Depends, HTTPException, status
+from sqlalchemy import case, func, select, update
 from sqlalchemy.orm import Session
 from src.entities.order import Order, OrderItem
 from src.entities.reviews import Review
@@ -7,6 +10,11 @@ from src.review.models import ReviewCreate
 from src.entities.products import Product
 from src.auth.service import get_current_user, require_role
 from src.entities.users import User, UserRole
+from src.products.cache import catalog_cache
+
+
+RATING_COLUMNS = ("rating_1", "rating_2", "rating_3", "rating_4", "rating_5")
+REPAIR_BATCH_SIZE = 1000
 
 
 
@@ -35,6 +43,57 @@ def create_review(review: ReviewCreate, current_user: User = Depends(require_rol
     
     db_review = Review(user_id=current_user.id, **review.dict())
     db.add(db_review)
+    # Increment in SQL so concurrent reviews of one product never lose a count
+    star = RATING_COLUMNS[review.rating - 1]
+    db.execute(
+        update(Product).where(Product.id == review.product_id).values(
+            rating_count=Product.rating_count + 1,
+            rating_sum=Product.rating_sum + review.rating,
+            **{star: getattr(Product, star) + 1}
+        ),
+        execution_options={"synchronize_session": False}
+    )
     db.commit()
     db.refresh(db_review)
+    catalog_cache.invalidate_products([review.product_id])
     return db_review
+
+
+def repair_rating_aggregates(db: Session, product_ids: Optional[Iterable[int]] = None) -> dict:
+    """Recompute product rating aggregates from the reviews table.
+
+    Backfills the columns after they are added and repairs any drift.
+    Only products whose stored values differ are written.
+    """
+    fields = ("rating_count", "rating_sum") + RATING_COLUMNS
+    actual = select(
+        Review.product_id,
+        func.count(Review.id),
+        func.coalesce(func.sum(Review.rating), 0),
+        *[func.sum(case((Review.rating == star, 1), else_=0)) for star in range(1, 6)]
+    ).group_by(Review.product_id)
+    stored = select(Product.id, *[getattr(Product, field) for field in fields])
+    if product_ids is not None:
+        product_ids = list(product_ids)
+        actual = actual.where(Review.product_id.in_(product_ids))
+        stored = stored.where(Product.id.in_(product_ids))
+
+    expected = {row[0]: tuple(row[1:]) for row in db.execute(actual)}
+    empty = (0,) * len(fields)
+
+    checked = 0
+    changes = []
+    updated_at = datetime.utcnow()
+    for row in db.execute(stored).all():
+        checked += 1
+        values = expected.get(row[0], empty)
+        if tuple(row[1:]) != values:
+            changes.append({"id": row[0], "updated_at": updated_at, **dict(zip(fields, values))})
+
+    for start in range(0, len(changes), REPAIR_BATCH_SIZE):
+        db.execute(update(Product), changes[start:start + REPAIR_BATCH_SIZE])
+    db.commit()
+
+    if changes:
+        catalog_cache.invalidate_products([change["id"] for change in changes])
+    return {"checked": checked, "repaired": len(changes)}
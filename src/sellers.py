@@ -1,12 +1,13 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.orm import Session
 from src.entities.users import User, UserRole
 from src.entities.products import Product
 from src.entities.order import Order, OrderStatus, OrderItem
 from src.order.models import OrderResponse
 from src.auth.service import require_role
-from src.database.core import get_db
-from typing import List
+from src.database.core import get_read_db
+from typing import List, Optional
+from src.pagination import LimitParam, CursorParam, paginate, get_page, set_next_cursor
 from src.products.models import ProductResponse
 from sqlalchemy import func
 
@@ -18,7 +19,7 @@ router = APIRouter(
 
 
 @router.get("/stats")
-def get_seller_stats(current_user: User = Depends(require_role(UserRole.SELLER)), db: Session = Depends(get_db)):
+def get_seller_stats(current_user: User = Depends(require_role(UserRole.SELLER)), db: Session = Depends(get_read_db)):
     
     total_products = db.query(Product).filter(Product.seller_id == current_user.id).count()
     active_products = db.query(Product).filter(
@@ -39,14 +40,19 @@ def get_seller_stats(current_user: User = Depends(require_role(UserRole.SELLER))
 
 
 @router.get("/products", response_model=List[ProductResponse])
-def get_seller_products(current_user: User = Depends(require_role(UserRole.SELLER)), 
-                       db: Session = Depends(get_db)):
-    return db.query(Product).filter(Product.seller_id == current_user.id).all()
+def get_seller_products(response: Response, current_user: User = Depends(require_role(UserRole.SELLER)), 
+                       skip: int = 0, limit: int = LimitParam, cursor: Optional[str] = CursorParam,
+                       db: Session = Depends(get_read_db)):
+    keys = [Product.id]
+    query = paginate(db.query(Product).filter(Product.seller_id == current_user.id), keys, cursor, limit, skip)
+    products, next_cursor = get_page(query.all(), keys, limit)
+    set_next_cursor(response, next_cursor)
+    return products
 
 
 @router.get("/orders", response_model=List[OrderResponse])
 def get_seller_orders(current_user: User = Depends(require_role(UserRole.SELLER)), 
-                     db: Session = Depends(get_db)):
+                     db: Session = Depends(get_read_db)):
     
     orders = db.query(Order).join(OrderItem).join(Product).filter(
         Product.seller_id == current_user.id
@@ -0,0 +1,115 @@
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import List, Optional
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    """Application settings, read once from the environment and `.env`.
+
+    Environment variables take precedence over `.env`. Field names match
+    the `.env` keys case-insensitively (`DB_POOL_SIZE` -> `db_pool_size`).
+    """
+
+    model_config = SettingsConfigDict(env_file=".env", env_ignore_empty=True, extra="ignore")
+
+    # Database
+    database_url: Optional[str] = None
+    database_username: Optional[str] = None
+    database_password: Optional[str] = None
+    database_hostname: Optional[str] = None
+    database_name: Optional[str] = None
+    database_replica_urls: str = ""
+    primary_pin_seconds: float = 5.0
+
+    # Connection pool (per worker)
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: float = 10.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_timeout_ms: int = 30000
+
+    # Tokens. SECRET is required and must be the same on every worker
+    secret: str
+    algorithm: str = "HS256"
+    access_token_expire_minutes: int = 15
+    refresh_token_expire_days: int = 30
+
+    # Authenticated-user cache
+    principal_cache_ttl_seconds: float = 30.0
+    principal_cache_max_size: int = 10000
+
+    # Product catalog cache
+    catalog_cache_ttl_seconds: float = 30.0
+    catalog_cache_max_products: int = 10000
+    catalog_cache_max_pages: int = 1000
+
+    # Password hashing
+    bcrypt_rounds: int = 12
+    password_hash_workers: Optional[int] = None
+    password_hash_max_queue: int = 64
+
+    # Image processing
+    image_workers: Optional[int] = None
+    # On-demand resized images, kept on disk up to this many bytes
+    resize_cache_dir: str = "cache/resized"
+    resize_cache_max_bytes: int = 256 * 1024 * 1024
+
+    # Image uploads: "cloudinary", or "local" to store under local_storage_dir
+    storage_backend: str = "cloudinary"
+    local_storage_dir: str = "static/uploads"
+    upload_workers: int = 4
+    upload_max_attempts: int = 5
+    upload_retry_base_seconds: float = 2.0
+    upload_lease_seconds: float = 300.0
+    upload_poll_seconds: float = 5.0
+    # Images whose last reference was released (replaced product images and
+    # profile pictures, deleted uploads) are kept this long before
+    # collect_orphans deletes them
+    orphan_image_grace_hours: int = 24
+
+    # Email
+    email_enabled: bool = False
+    email: Optional[str] = None
+    password: Optional[str] = None
+    mail_server: str = "smtp.gmail.com"
+    mail_port: int = 587
+    email_timeout: int = 10
+
+    # Default admin account
+    admin_email: str = "admin@ecommerce.com"
+    admin_password: str = "Admin@123456!"
+    admin_username: str = "admin"
+
+    @property
+    def replica_urls(self) -> List[str]:
+        return [url.strip() for url in self.database_replica_urls.split(",") if url.strip()]
+
+
+@lru_cache
+def _load_settings() -> Settings:
+    return Settings()
+
+
+_overrides: List[Settings] = []
+
+
+def get_settings() -> Settings:
+    return _overrides[-1] if _overrides else _load_settings()
+
+
+@contextmanager
+def override_settings(**values):
+    """Temporarily replace settings, e.g. for a test or benchmark run.
+
+    Only values read at call time are affected. Engines, pools, caches and
+    executors are built from settings at import, so set those through
+    environment variables before importing the app.
+    """
+    settings = get_settings().model_copy(update=values)
+    _overrides.append(settings)
+    try:
+        yield settings
+    finally:
+        _overrides.remove(settings)
@@ -0,0 +1,246 @@
+"""Serve /static with long-lived caching and precompressed files.
+
+Run as a module to write gzip (and, with the brotli package installed,
+brotli) siblings next to compressible files:
+
+    python -m src.static_files --directory static
+"""
+import argparse
+import gzip
+import hashlib
+import os
+import re
+import stat
+import sys
+import threading
+from collections import OrderedDict
+from mimetypes import guess_type
+from pathlib import Path
+import anyio
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from src.http_cache import IMMUTABLE_CACHE_CONTROL
+from src.upload_settings import UPLOAD_DIR
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# Files whose URL changes with their content are cached forever; anything
+# else is revalidated with its ETag on every use.
+REVALIDATE_CACHE_CONTROL = "public, no-cache"
+
+FINGERPRINT_LENGTH = 12
+FINGERPRINTED_RE = re.compile(r"^(?P<stem>.+)\.(?P<fingerprint>[0-9a-f]{%d})(?P<suffix>\.[^./]+)$" % FINGERPRINT_LENGTH)
+# Uploads and their variants are already named by their SHA-256 digest
+CONTENT_ADDRESSED_RE = re.compile(r"^[0-9a-f]{64}(-[a-z]+)?\.[a-z0-9]+$")
+
+# Content-Encoding -> sibling suffix, in order of preference
+PRECOMPRESSED = {"br": ".br", "gzip": ".gz"}
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "application/xml", "image/svg+xml")
+MIN_COMPRESS_SIZE = 1024
+
+
+def is_compressible(path: str) -> bool:
+    media_type = guess_type(path)[0] or ""
+    return media_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def file_fingerprint(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        while chunk := file.read(64 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()[:FINGERPRINT_LENGTH]
+
+
+class FingerprintCache:
+    """Content fingerprints by path, recomputed when size or mtime change."""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: str, stat_result: os.stat_result = None) -> str:
+        stat_result = stat_result or os.stat(path)
+        version = (stat_result.st_mtime_ns, stat_result.st_size)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(path)
+                return entry[1]
+
+        fingerprint = file_fingerprint(path)
+        with self._lock:
+            self._entries[path] = (version, fingerprint)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return fingerprint
+
+
+fingerprints = FingerprintCache()
+
+
+def fingerprinted_path(path) -> Path:
+    """`path` with its content fingerprint before the suffix; content-addressed names are returned unchanged."""
+    path = Path(path)
+    if CONTENT_ADDRESSED_RE.match(path.name):
+        return path
+    return path.with_name(f"{path.stem}.{fingerprints.get(str(path))}{path.suffix}")
+
+
+def static_url(path) -> str:
+    """The URL of a file under the static directory, changing whenever its content does.
+
+    Such URLs are served with immutable caching.
+    """
+    return "/" + fingerprinted_path(path).as_posix()
+
+
+def accepted_encodings(accept_encoding: str) -> set:
+    encodings = set()
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                if float(params[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        encodings.add(name.strip().lower())
+    return encodings
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles with Cache-Control, fingerprinted names and precompressed siblings.
+
+    A request for `name.<fingerprint>.ext` serves `name.ext` and is cached
+    as immutable while the fingerprint matches its content; a stale
+    fingerprint still serves the file, but revalidated. For compressible
+    types a fresh `.br` or `.gz` sibling is sent instead when the client
+    accepts it. Ranges (206/416, If-Range) come from FileResponse and
+    If-None-Match / If-Modified-Since from StaticFiles, both on whichever
+    file is sent.
+    """
+
+    def _lookup(self, path: str) -> tuple:
+        try:
+            return self.lookup_path(path)
+        except OSError:
+            return "", None
+
+    def _resolve(self, path: str) -> tuple:
+        # Returns (full_path, stat_result, immutable)
+        full_path, stat_result = self._lookup(path)
+        name = os.path.basename(path)
+        if stat_result:
+            return full_path, stat_result, bool(CONTENT_ADDRESSED_RE.match(name))
+
+        match = FINGERPRINTED_RE.match(name)
+        if not match:
+            return "", None, False
+        full_path, stat_result = self._lookup(os.path.join(os.path.dirname(path), match["stem"] + match["suffix"]))
+        if not stat_result or not stat.S_ISREG(stat_result.st_mode):
+            return "", None, False
+        return full_path, stat_result, fingerprints.get(full_path, stat_result) == match["fingerprint"]
+
+    def _precompressed(self, full_path: str, stat_result: os.stat_result, accept_encoding: str) -> tuple:
+        # Returns (encoding, path to send, its stat_result, has_siblings)
+        if not is_compressible(full_path):
+            return None, full_path, stat_result, False
+
+        accepted = accepted_encodings(accept_encoding)
+        has_siblings = False
+        for encoding, suffix in PRECOMPRESSED.items():
+            try:
+                sibling = os.stat(full_path + suffix)
+            except OSError:
+                continue
+            # An older sibling is out of date; never send it
+            if sibling.st_mtime < stat_result.st_mtime:
+                continue
+            has_siblings = True
+            if encoding in accepted:
+                return encoding, full_path + suffix, sibling, True
+
+        return None, full_path, stat_result, has_siblings
+
+    def _select(self, path: str, accept_encoding: str) -> tuple:
+        # One trip to a thread for all the file system calls of a request
+        full_path, stat_result, immutable = self._resolve(path)
+        if not stat_result or not stat.S_ISREG(stat_result.st_mode):
+            return None
+        return (full_path, immutable) + self._precompressed(full_path, stat_result, accept_encoding)
+
+    async def get_response(self, path: str, scope):
+        if scope["method"] not in ("GET", "HEAD"):
+            raise HTTPException(status_code=405)
+
+        request_headers = Headers(scope=scope)
+        selected = await anyio.to_thread.run_sync(self._select, path, request_headers.get("accept-encoding", ""))
+        if selected is None:
+            raise HTTPException(status_code=404)
+        full_path, immutable, encoding, send_path, send_stat, has_siblings = selected
+
+        headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL}
+        if has_siblings:
+            headers["Vary"] = "Accept-Encoding"
+        if encoding:
+            headers["Content-Encoding"] = encoding
+
+        response = FileResponse(
+            send_path,
+            stat_result=send_stat,
+            media_type=guess_type(full_path)[0] or "text/plain",
+            headers=headers
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+def compress_file(path: Path) -> list:
+    data = path.read_bytes()
+    written = []
+    candidates = [(".gz", lambda: gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        candidates.append((".br", lambda: brotli.compress(data, quality=11)))
+
+    for suffix, compress in candidates:
+        sibling = path.with_name(path.name + suffix)
+        if sibling.exists() and sibling.stat().st_mtime >= path.stat().st_mtime:
+            continue
+        compressed = compress()
+        # Not worth a Content-Encoding if it barely shrinks
+        if len(compressed) < len(data) * 0.9:
+            sibling.write_bytes(compressed)
+            written.append(sibling)
+    return written
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Write precompressed siblings of compressible static files")
+    parser.add_argument("--directory", default=str(UPLOAD_DIR))
+    args = parser.parse_args(argv)
+
+    written = 0
+    for root, _, files in os.walk(args.directory):
+        for name in files:
+            path = Path(root) / name
+            if path.suffix in (".gz", ".br") or not is_compressible(name) or path.stat().st_size < MIN_COMPRESS_SIZE:
+                continue
+            written += len(compress_file(path))
+
+    print(f"Wrote {written} precompressed files{'' if brotli else ' (gzip only: install brotli for .br)'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
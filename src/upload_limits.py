@@ -0,0 +1,53 @@
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+from src.upload_settings import MAX_FILE_SIZE, FILE_TOO_LARGE
+
+
+# Room for multipart boundaries, part headers and the other form fields
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class UploadSizeLimitMiddleware:
+    """Cuts off multipart request bodies larger than `max_body_size`.
+
+    The form parser spools a whole body to disk before an endpoint sees
+    it, so the limit is enforced here as the body arrives: a Content-Length
+    over it is answered with 413 without reading anything, and a chunked
+    body is aborted once its running total passes it. Paths starting with
+    one of `exempt` (bulk imports) are not limited.
+    """
+
+    def __init__(self, app, max_body_size: int = MAX_FILE_SIZE + MULTIPART_OVERHEAD, exempt: tuple = ()):
+        self.app = app
+        self.max_body_size = max_body_size
+        self.exempt = tuple(exempt)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(self.exempt):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        # Media types are case-insensitive
+        if not headers.get(b"content-type", b"").lower().startswith(b"multipart/form-data"):
+            await self.app(scope, receive, send)
+            return
+
+        content_length = headers.get(b"content-length", b"")
+        if content_length.isdigit() and int(content_length) > self.max_body_size:
+            response = JSONResponse({"detail": FILE_TOO_LARGE}, status_code=413, headers={"Connection": "close"})
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    raise HTTPException(status_code=413, detail=FILE_TOO_LARGE)
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -1,8 +1,11 @@
 
 from fastapi import UploadFile, HTTPException
-import shutil
-import uuid
+import hashlib
+import os
+import re
+import tempfile
 from pathlib import Path
+from typing import Optional
 
 
 UPLOAD_DIR = Path("static")
@@ -14,39 +17,74 @@ PROFILE_IMAGES_DIR.mkdir(exist_ok=True)
 PRODUCT_IMAGES_DIR = UPLOAD_DIR / "products"
 PRODUCT_IMAGES_DIR.mkdir(exist_ok=True)
 
-ALLOWED_IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
+PRODUCT_VARIANTS_DIR = PRODUCT_IMAGES_DIR / "variants"
+PRODUCT_VARIANTS_DIR.mkdir(exist_ok=True)
+
 MAX_FILE_SIZE = 5 * 1024 * 1024 
+FILE_TOO_LARGE = f"File too large. Maximum size: {MAX_FILE_SIZE / (1024*1024)}MB"
+COPY_CHUNK_SIZE = 64 * 1024
 
+# Files saved before content addressing were named uuid4() + extension
+LEGACY_UPLOAD_RE = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}\.(jpg|jpeg|png|gif|webp)$")
 
-def validate_image_file(file: UploadFile) -> None:
-    
-    file_ext = Path(file.filename).suffix.lower()
-    if file_ext not in ALLOWED_IMAGE_EXTENSIONS:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid file type. Allowed types: {', '.join(ALLOWED_IMAGE_EXTENSIONS)}"
-        )
-    
-    
-    file.file.seek(0, 2)
-    file_size = file.file.tell()
-    file.file.seek(0)
-    
-    if file_size > MAX_FILE_SIZE:
+# Leading bytes of each accepted format and the extension it is stored with
+IMAGE_SIGNATURES = [
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"GIF87a", ".gif"),
+    (b"GIF89a", ".gif"),
+]
+
+
+def sniff_image_type(head: bytes) -> Optional[str]:
+    """The extension for an image's first bytes, or None if it is not an accepted format."""
+    for signature, extension in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return extension
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ".webp"
+    return None
+
+
+def ingest_image_upload(file: UploadFile, directory: Path) -> tuple:
+    """Validate an uploaded image and write it to a temporary file in `directory`.
+
+    One pass over the upload: the format is sniffed from the first chunk
+    before anything is written, then the content is hashed while it is
+    copied and the copy stops as soon as it passes MAX_FILE_SIZE. The
+    filename and its extension are not trusted.
+
+    Returns (temp_path, sha256 hex digest, size, extension). The caller
+    moves the file to its content-addressed name or deletes it.
+    """
+    head = file.file.read(COPY_CHUNK_SIZE)
+    extension = sniff_image_type(head)
+    if extension is None:
         raise HTTPException(
             status_code=400,
-            detail=f"File too large. Maximum size: {MAX_FILE_SIZE / (1024*1024)}MB"
+            detail="Invalid file type. Allowed types: JPEG, PNG, GIF, WebP"
         )
 
-def save_upload_file(file: UploadFile, directory: Path) -> str:
-    file_ext = Path(file.filename).suffix.lower()
-    unique_filename = f"{uuid.uuid4()}{file_ext}"
-    file_path = directory / unique_filename
+    digest = hashlib.sha256()
+    size = 0
+    with tempfile.NamedTemporaryFile(dir=directory, prefix=".upload-", delete=False) as buffer:
+        chunk = head
+        while chunk:
+            size += len(chunk)
+            if size > MAX_FILE_SIZE:
+                break
+            digest.update(chunk)
+            buffer.write(chunk)
+            chunk = file.file.read(COPY_CHUNK_SIZE)
 
-    with file_path.open("wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-    
-    return str(file_path)
+    if size > MAX_FILE_SIZE:
+        os.remove(buffer.name)
+        raise HTTPException(status_code=413, detail=FILE_TOO_LARGE)
 
+    return buffer.name, digest.hexdigest(), size, extension
 
 
+def is_legacy_upload(path: str, directory: Path) -> bool:
+    """Whether `path` names a file the server saved directly in `directory` before content addressing."""
+    resolved = Path(path).resolve()
+    return resolved.parent == directory.resolve() and bool(LEGACY_UPLOAD_RE.match(resolved.name))
@@ -37,6 +37,6 @@ def users_profile(current_user: User = Depends(require_role([UserRole.SELLER, Us
     return user_profiles(current_user)
 
 @router.post("/upload/profile-picture")
-async def upload_user_profile(file: UploadFile = File(...), current_user: User = Depends(require_role([UserRole.SELLER, UserRole.ADMIN, UserRole.CUSTOMER])), db: Session = Depends(get_db)):
+def upload_user_profile(file: UploadFile = File(...), current_user: User = Depends(require_role([UserRole.SELLER, UserRole.ADMIN, UserRole.CUSTOMER])), db: Session = Depends(get_db)):
     
-    return await upload_profile_picture(file, current_user, db)
\ No newline at end of file
+    return upload_profile_picture(file, current_user, db)
\ No newline at end of file
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from typing import Optional
+from src.entities.users import UserRole
 
 class UserResponse(BaseModel):
     id: int
@@ -7,6 +8,7 @@ class UserResponse(BaseModel):
     username: str
     full_name: Optional[str]
     phone: Optional[str]
+    profile_picture: Optional[str] = None
     is_active: bool
     
     class Config:
@@ -1,13 +1,11 @@
 from sqlalchemy.orm import Session
 from fastapi import Depends, HTTPException, UploadFile
 from src.entities.users import User, UserRole
-from src.auth.service import require_role
+from src.auth.service import require_role, principal_cache
 from src.database.core import get_db
 from typing import Optional
-from src.upload_settings import validate_image_file, save_upload_file, PROFILE_IMAGES_DIR
-from src.entities.images import Image
-from ..cloudinary_config import cloudinary
-import cloudinary.uploader
+from src.upload_settings import PROFILE_IMAGES_DIR
+from src.images.service import store_image, release_image, enqueue_upload
 
 
 def list_users(current_user: User = Depends(require_role(UserRole.ADMIN)), db: Session = Depends(get_db)):
@@ -29,6 +27,7 @@ def update_user(user_id: int, full_name: Optional[str] = None, phone: Optional[s
     
     db.commit()
     db.refresh(user)
+    principal_cache.invalidate(user.id)
     
     return user
 
@@ -37,28 +36,24 @@ def user_profiles(current_user: User = Depends(require_role([UserRole.SELLER, Us
    
     return current_user
 
-async def upload_profile_picture(file: UploadFile, current_user: User = Depends(require_role([UserRole.SELLER, UserRole.ADMIN, UserRole.CUSTOMER])), db: Session = Depends(get_db)):
+def upload_profile_picture(file: UploadFile, current_user: User = Depends(require_role([UserRole.SELLER, UserRole.ADMIN, UserRole.CUSTOMER])), db: Session = Depends(get_db)):
  
-    validate_image_file(file)
-
-    saved_path = save_upload_file(file, PROFILE_IMAGES_DIR)
-
-    
-    upload_result = cloudinary.uploader.upload(saved_path,
-                                               folder="Uploading Images")
-
-    image_url = upload_result.get("secure_url")
-    public_id = upload_result.get("public_id")
-
-    image_record = Image(url=image_url, public_id=public_id)
-    db.add(image_record)
-    db.commit()
-    db.refresh(image_record)
+    image_record = store_image(file, PROFILE_IMAGES_DIR, db)
+    user = db.query(User).filter(User.id == current_user.id).first()
+    # The user holds a reference on their picture; the replaced one is
+    # collected after the grace period
+    if user.profile_image_id:
+        release_image(user.profile_image_id, db)
+    user.profile_image_id = image_record.id
+    user.profile_picture = image_record.url
+    image_record = enqueue_upload(image_record, "Uploading Images", db)
+    principal_cache.invalidate(user.id)
 
     return {
-        "message": "Profile picture uploaded successful",
-        "image_url": image_url,
-        "public_id": public_id,
+        "message": "Profile picture accepted for upload",
+        "status": image_record.status.value,
+        "image_url": image_record.url,
+        "public_id": image_record.public_id,
         "id": image_record.id
     }
     
\ No newline at end of file